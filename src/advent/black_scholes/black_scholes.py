@@ -1,10 +1,14 @@
-import yfinance as yf
-import pandas as pd
+import os
+import sys
+
 import numpy as np
 from scipy.stats import norm
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import load_bars, trim_warmup
+
 # Add Moving Average Cross strat
 def add_strategy(data, short_window=20, long_window=50):
     data['Short_MA'] = data['Close'].rolling(window=short_window).mean()
@@ -24,32 +28,18 @@ def get_stock_data(tickers, start, end):
     data = {}
 
     for ticker in tickers:
-        try:
-            df = pd.read_csv(f"../CSVs/{ticker}_returns.csv", index_col=0, parse_dates=True)
-            data[ticker] = df
-        except Exception as e:
-            print(f"Error: {e}")
-
-            df = yf.download(ticker, start=start, end=end)
-            data[ticker] = df
-            df.to_csv(f"../CSVs/{ticker}_returns.csv")
+        data[ticker] = load_bars(ticker, start=start, end=end)
 
     return data
 
 def add_moving_average_strategy(data, short_window=20, long_window=50):
-    # Convert Close column to numeric
-    data["Close"] = pd.to_numeric(data["Close"], errors="coerce")
-
-    # Drop rows where Close could not be converted
-    data = data.dropna(subset=["Close"])
+    # Expects bars from load_bars: Close is already numeric and complete
 
     # Compute moving averages
     data["Short_MA"] = data["Close"].rolling(window=short_window).mean()
     data["Long_MA"] = data["Close"].rolling(window=long_window).mean()
 
-    data = data.dropna()
-
-    # Generate buy/sell/hold signals
+    # Generate buy/sell/hold signals (warmup rows compare against NaN and stay 0)
     data["Signal"] = np.where(
         (data["Short_MA"] > data["Long_MA"]) & (data["Short_MA"].shift(1) <= data["Long_MA"].shift(1)), 1,
         np.where(
@@ -68,10 +58,10 @@ def calculate_indicators(data):
     data["RSI"] = 100 - (100 / (1 + rs))
 
     data["MA_20"] = data["Close"].rolling(window=20).mean()
-    data["Upper_Band"] = data["MA_20"] + 2 * data["Close"].rolling(window=20).std()
-    data["Lower_Band"] = data["MA_20"] - 2 * data["Close"].rolling(window=20).std()
+    std_20 = data["Close"].rolling(window=20).std()
+    data["Upper_Band"] = data["MA_20"] + 2 * std_20
+    data["Lower_Band"] = data["MA_20"] - 2 * std_20
 
-    data = data.dropna()
     return data
 
 def plot(data, ticker):
@@ -158,18 +148,11 @@ def plot_with_strategy(data, ticker):
 
 
 def calculate_volatility(data):
-    # Ensure numeric Close column
-    data['Close'] = pd.to_numeric(data['Close'], errors='coerce')
+    # Expects bars from load_bars: Close is already numeric and complete
 
-    # Drop rows where Close is missing/invalid
-    data = data.dropna(subset=["Close"])
-
-    # Compute log returns
+    # Compute log returns (first row is NaN and is skipped by the rolling window)
     data['log_returns'] = np.log(data['Close'] / data['Close'].shift(1))
 
-    # Drop the first NaN caused by shift(1)
-    data = data.dropna(subset=["log_returns"])
-
     # Rolling volatility (20 days)
     data['Rolling_Std'] = data['log_returns'].rolling(window=20).std()
 
@@ -192,32 +175,24 @@ def black_scholes(S, K, T, r, sigma, option_type="call"):
 def calculate_option_price_bs(data, risk_free_rate=0.03, days_till_expiration=30):
     T = days_till_expiration / 252
 
-    data = data.dropna().copy()
-
-    # call price column
-    data.loc[:, "Call_Price"] = data.apply(
-        lambda row: black_scholes(
-            S=row["Close"],
-            K=row["Close"] + 1,
-            T=T,
-            r=risk_free_rate,
-            sigma=row["Annualized_Vol"],
-            option_type="call"
-        ),
-        axis=1
+    # black_scholes is vectorized, so price every row at once instead of a row-wise apply.
+    # Rows still warming up (no Annualized_Vol yet) get NaN prices.
+    data["Call_Price"] = black_scholes(
+        S=data["Close"],
+        K=data["Close"] + 1,
+        T=T,
+        r=risk_free_rate,
+        sigma=data["Annualized_Vol"],
+        option_type="call"
     )
 
-    # put price column
-    data.loc[:, "Put_Price"] = data.apply(
-        lambda row: black_scholes(
-            S=row["Close"],
-            K=row["Close"] - 1,
-            T=T,
-            r=risk_free_rate,
-            sigma=row["Annualized_Vol"],
-            option_type="put"
-        ),
-        axis=1
+    data["Put_Price"] = black_scholes(
+        S=data["Close"],
+        K=data["Close"] - 1,
+        T=T,
+        r=risk_free_rate,
+        sigma=data["Annualized_Vol"],
+        option_type="put"
     )
 
     return data
@@ -281,4 +256,5 @@ if __name__ == "__main__":
     for ticker, data in stock_data.items():
         data = calculate_volatility(data)
         data = calculate_option_price_bs(data)
+        data = trim_warmup(data)
         plot_with_options(data, ticker)
\ No newline at end of file
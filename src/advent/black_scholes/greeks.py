@@ -0,0 +1,58 @@
+import numpy as np
+from scipy.special import ndtr
+from scipy.stats import norm
+
+# Vectorized Black-Scholes price and Greeks. Every argument broadcasts, so a
+# whole book (or a book x scenario grid) is priced in one call.
+# Units: T in years, vega per 1.00 of vol, theta per year, rho per 1.00 of rate.
+
+
+def d1_d2(S, K, T, r, sigma):
+    sig_sqrt_t = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / sig_sqrt_t
+    return d1, d1 - sig_sqrt_t
+
+
+def bs_price(S, K, T, r, sigma, is_call):
+    S, K, T, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, sigma)))
+    expired = T <= 0
+    T_safe = np.where(expired, 1.0, T)
+
+    d1, d2 = d1_d2(S, K, T_safe, r, sigma)
+    disc_k = K * np.exp(-r * T_safe)
+    call = S * ndtr(d1) - disc_k * ndtr(d2)
+    put = disc_k * ndtr(-d2) - S * ndtr(-d1)
+    price = np.where(is_call, call, put)
+
+    # At (or past) expiry an option is worth its intrinsic value
+    intrinsic = np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+    return np.where(expired, intrinsic, price)
+
+
+def bs_greeks(S, K, T, r, sigma, is_call):
+    S, K, T, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, sigma)))
+    sqrt_t = np.sqrt(T)
+    sig_sqrt_t = sigma * sqrt_t
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / sig_sqrt_t
+    return greeks_from_d1(S, d1, sig_sqrt_t, K * np.exp(-r * T), sigma, sqrt_t, T, r, is_call)
+
+
+def greeks_from_d1(S, d1, sig_sqrt_t, disc_k, sigma, sqrt_t, T, r, is_call):
+    # Shared by bs_greeks and RiskEngine, which caches the spot-independent terms
+    d2 = d1 - sig_sqrt_t
+    pdf_d1 = norm.pdf(d1)
+    cdf_d1 = ndtr(d1)
+    cdf_d2 = ndtr(d2)
+
+    call_price = S * cdf_d1 - disc_k * cdf_d2
+    decay = -S * pdf_d1 * sigma / (2 * sqrt_t)
+
+    # Put values from put-call parity
+    return {
+        "price": np.where(is_call, call_price, call_price - S + disc_k),
+        "delta": np.where(is_call, cdf_d1, cdf_d1 - 1.0),
+        "gamma": pdf_d1 / (S * sig_sqrt_t),
+        "vega": S * pdf_d1 * sqrt_t,
+        "theta": np.where(is_call, decay - r * disc_k * cdf_d2, decay + r * disc_k * (1.0 - cdf_d2)),
+        "rho": np.where(is_call, T * disc_k * cdf_d2, -T * disc_k * (1.0 - cdf_d2)),
+    }
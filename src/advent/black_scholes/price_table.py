@@ -0,0 +1,313 @@
+import math
+import os
+import time
+
+import numpy as np
+from scipy.special import ndtr
+from scipy.stats import norm
+
+from greeks import bs_greeks, bs_price
+
+# Black-Scholes terms precomputed on a regular grid of
+#   f = log(S * exp(r * T) / K)   forward moneyness
+#   v = sigma * sqrt(T)           total vol
+# Normalizing by the forward and the total vol folds time and rate into the two
+# axes, so one 2-D table serves every expiry and every rate. Each node holds
+# the discounted-strike call price, N(d1) and n(d1) (N(d2) follows from the
+# call price); the table stores them as per-cell bilinear coefficients, so a
+# lookup is one gather per coefficient and a short polynomial instead of
+# log/exp/ndtr calls.
+COLUMNS = ["call", "cdf_d1", "pdf_d1"]
+
+CACHE_DIR = "../CSVs/price_tables"
+
+
+def _terms(f, v):
+    d1 = f / v + 0.5 * v
+    cdf_d1 = ndtr(d1)
+    return np.stack([np.exp(f) * cdf_d1 - ndtr(d1 - v), cdf_d1, norm.pdf(d1)])
+
+
+def _coefficients(table):
+    # (columns, nf, nv) node values -> (columns, 4, nf - 1, nv - 1) so that inside a
+    # cell value = a + b * wf + (c + d * wf) * wv for offsets wf, wv in [0, 1)
+    c00, c01 = table[:, :-1, :-1], table[:, :-1, 1:]
+    c10, c11 = table[:, 1:, :-1], table[:, 1:, 1:]
+    return np.stack([c00, c10 - c00, c01 - c00, c11 - c10 - c01 + c00], axis=1)
+
+
+def _closed_form_greeks(S, K, T, r, sigma, is_call):
+    # Quotes outside the table; expired ones get intrinsic value and a step delta
+    expired = T <= 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        greeks = bs_greeks(S, K, np.where(expired, 1.0, T), r, sigma, is_call)
+    del greeks["rho"]
+    greeks["price"] = bs_price(S, K, T, r, sigma, is_call)
+    greeks["delta"] = np.where(expired, np.where(is_call, S > K, -1.0 * (S < K)), greeks["delta"])
+    for name in ["gamma", "vega", "theta"]:
+        greeks[name] = np.where(expired, 0.0, greeks[name])
+    return greeks
+
+
+class PriceTable:
+    def __init__(self, risk_free_rate=0.03, moneyness=(-0.5, 0.5), total_vol=(0.01, 1.0),
+                 tolerance=1e-4, max_points=50_000_000, cache_dir=CACHE_DIR):
+        self.r = risk_free_rate
+        self.moneyness = moneyness
+        self.total_vol = total_vol
+        self.tolerance = tolerance  # max interpolated call price error per unit of discounted strike
+        self.max_points = max_points
+        self.cache_dir = cache_dir
+        self.table = None
+
+    def _cache_path(self):
+        key = f"f{self.moneyness[0]:g}_{self.moneyness[1]:g}_v{self.total_vol[0]:g}_{self.total_vol[1]:g}_tol{self.tolerance:g}"
+        return os.path.join(self.cache_dir, f"bs_coef_{key}.npy")
+
+    def _ensure(self):
+        # Built on first use, then memory-mapped from disk by every later process
+        if self.table is not None:
+            return
+
+        path = self._cache_path()
+        if not os.path.exists(path):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp.npy"  # per process, so concurrent builds don't collide
+            np.save(tmp_path, _coefficients(self._build()))
+            os.replace(tmp_path, path)
+
+        self.table = np.load(path, mmap_mode="r")
+        self._nf, self._nv = self.table.shape[2:]  # cells per axis
+        # (columns, 4, cells): every coefficient is one contiguous 1-D array to gather from
+        self._coef = np.asarray(self.table).reshape(len(COLUMNS), 4, -1)
+        self._f_scale = self._nf / (self.moneyness[1] - self.moneyness[0])
+        self._v_scale = self._nv / (self.total_vol[1] - self.total_vol[0])
+
+    def _build(self):
+        nf, nv = 101, 101
+        while True:
+            f = np.linspace(*self.moneyness, nf)
+            v = np.linspace(*self.total_vol, nv)
+            table = _terms(*np.meshgrid(f, v, indexing="ij"))
+
+            # Worst error sits at cell centres
+            f_mid = 0.5 * (f[1:] + f[:-1])
+            v_mid = 0.5 * (v[1:] + v[:-1])
+            exact = _terms(*np.meshgrid(f_mid, v_mid, indexing="ij"))[0]
+            call = table[0]
+            estimate = 0.25 * (call[1:, 1:] + call[1:, :-1] + call[:-1, 1:] + call[:-1, :-1])
+            error = np.abs(estimate - exact).max()
+            if error <= self.tolerance:
+                return table
+
+            nf, nv = 2 * nf - 1, 2 * nv - 1
+            if nf * nv * len(COLUMNS) > self.max_points:
+                raise ValueError(
+                    f"Tolerance {self.tolerance:g} needs more than {self.max_points} points "
+                    f"(error {error:.2e}), narrow the grid or raise max_points"
+                )
+
+    # --- arrays ---
+
+    def _cells(self, S, disc_k, v):
+        # Flat cell index and in-cell offsets per quote; ok is False outside the table
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fi = np.log(S / disc_k)
+            fi -= self.moneyness[0]
+            fi *= self._f_scale
+            vi = v - self.total_vol[0]
+            vi *= self._v_scale
+            ok = (fi >= 0) & (fi < self._nf) & (vi >= 0) & (vi < self._nv)
+        if not ok.all():
+            fi[~ok] = 0.0
+            vi[~ok] = 0.0
+
+        cell = fi.astype(np.intp)
+        j = vi.astype(np.intp)
+        fi -= cell
+        vi -= j
+        cell *= self._nv
+        cell += j
+        return cell, fi, vi, ok
+
+    def _interpolate(self, column, cell, wf, wv):
+        a, b, c, d = (np.take(coef, cell) for coef in self._coef[column])
+        d *= wf
+        d += c
+        d *= wv
+        b *= wf
+        a += b
+        a += d
+        return a
+
+    def _normalize(self, S, K, T, sigma, option_type):
+        S, K, T, sigma = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, K, T, sigma)))
+        option_type = np.asarray(option_type)
+        is_call = option_type if option_type.dtype == bool else option_type == "call"
+        is_call = np.broadcast_to(is_call, S.shape)
+        shape = S.shape
+        S, K, T, sigma, is_call = (a.ravel() for a in (S, K, T, sigma, is_call))
+        return shape, S, K, T, sigma, is_call
+
+    # --- single quotes: plain floats, no array overhead ---
+
+    def _scalar_terms(self, S, K, T, sigma, columns):
+        if T <= 0:
+            return None
+        disc_k = K * math.exp(-self.r * T)
+        sqrt_t = math.sqrt(T)
+        fi = (math.log(S / disc_k) - self.moneyness[0]) * self._f_scale
+        vi = (sigma * sqrt_t - self.total_vol[0]) * self._v_scale
+        if not (0 <= fi < self._nf and 0 <= vi < self._nv):
+            return None
+
+        i, j = int(fi), int(vi)
+        wf, wv = fi - i, vi - j
+        cell = i * self._nv + j
+        values = []
+        for column in columns:
+            a, b, c, d = self._coef[column, :, cell].tolist()
+            values.append(a + b * wf + (c + d * wf) * wv)
+        return disc_k, sqrt_t, values
+
+    @staticmethod
+    def _is_scalar(S, K, T, sigma, option_type):
+        return (all(isinstance(a, (int, float, np.number)) for a in (S, K, T, sigma))
+                and isinstance(option_type, (str, bool, np.bool_)))
+
+    def price(self, S, K, T, sigma, option_type="call"):
+        self._ensure()
+        if self._is_scalar(S, K, T, sigma, option_type):
+            is_call = option_type if isinstance(option_type, (bool, np.bool_)) else option_type == "call"
+            terms = self._scalar_terms(S, K, T, sigma, [0])
+            if terms is None:
+                return float(bs_price(S, K, T, self.r, sigma, is_call))
+            disc_k, _, (call,) = terms
+            return disc_k * call if is_call else disc_k * call - S + disc_k
+
+        shape, S, K, T, sigma, is_call = self._normalize(S, K, T, sigma, option_type)
+        disc_k = np.exp(T * -self.r)
+        disc_k *= K
+        v = np.sqrt(np.maximum(T, 0.0))
+        v *= sigma
+        cell, wf, wv, ok = self._cells(S, disc_k, v)
+
+        price = self._interpolate(0, cell, wf, wv)
+        price *= disc_k
+        parity = disc_k - S  # puts by put-call parity
+        parity *= ~is_call
+        price += parity
+
+        if not ok.all():
+            out = ~ok
+            price[out] = bs_price(S[out], K[out], T[out], self.r, sigma[out], is_call[out])
+        return price.reshape(shape)
+
+    def greeks(self, S, K, T, sigma, option_type="call"):
+        self._ensure()
+        if self._is_scalar(S, K, T, sigma, option_type):
+            is_call = option_type if isinstance(option_type, (bool, np.bool_)) else option_type == "call"
+            terms = self._scalar_terms(S, K, T, sigma, [0, 1, 2])
+            if terms is None:
+                greeks = _closed_form_greeks(*(np.array([x], dtype=float) for x in (S, K, T)), self.r,
+                                             np.array([sigma], dtype=float), np.array([is_call]))
+                return {name: float(value[0]) for name, value in greeks.items()}
+            disc_k, sqrt_t, (call, cdf_d1, pdf_d1) = terms
+            put = not is_call
+            call_price = disc_k * call
+            # disc_k * N(d2) = S * N(d1) - call price
+            return {
+                "price": call_price + put * (disc_k - S),
+                "delta": cdf_d1 - put,
+                "gamma": pdf_d1 / (S * sigma * sqrt_t),
+                "vega": S * pdf_d1 * sqrt_t,
+                "theta": -S * pdf_d1 * sigma / (2 * sqrt_t) - self.r * (S * cdf_d1 - call_price - put * disc_k),
+            }
+
+        shape, S, K, T, sigma, is_call = self._normalize(S, K, T, sigma, option_type)
+        disc_k = np.exp(T * -self.r)
+        disc_k *= K
+        sqrt_t = np.sqrt(np.maximum(T, 0.0))
+        v = sigma * sqrt_t
+        cell, wf, wv, ok = self._cells(S, disc_k, v)
+        call_price = self._interpolate(0, cell, wf, wv)
+        call_price *= disc_k
+        delta = self._interpolate(1, cell, wf, wv)
+        gamma = self._interpolate(2, cell, wf, wv)
+        put = ~is_call
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vega = S * gamma  # S * n(d1) for now
+            theta = vega * sigma
+            theta /= sqrt_t
+            theta *= -0.5
+            vega *= sqrt_t
+
+            # disc_k * N(d2) = S * N(d1) - call price
+            carry = S * delta
+            carry -= call_price
+            parity = disc_k - S
+            parity *= put
+            carry -= parity
+            carry -= S * put
+            carry *= self.r
+            theta -= carry
+
+            gamma /= S
+            gamma /= v
+
+        call_price += parity
+        delta -= put
+        greeks = {"price": call_price, "delta": delta, "gamma": gamma, "vega": vega, "theta": theta}
+
+        if not ok.all():
+            out = ~ok
+            exact = _closed_form_greeks(S[out], K[out], T[out], self.r, sigma[out], is_call[out])
+            for name, value in greeks.items():
+                value[out] = exact[name]
+        return {name: value.reshape(shape) for name, value in greeks.items()}
+
+
+def _best_time(func, repeat=3, number=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            result = func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, result
+
+
+def benchmark(table, n=1_000_000, seed=0):
+    rng = np.random.default_rng(seed)
+    S = rng.uniform(80, 120, n)
+    K = np.full(n, 100.0)
+    T = rng.uniform(5 / 252, 1.0, n)
+    sigma = rng.uniform(0.1, 0.5, n)
+    is_call = rng.random(n) < 0.5
+
+    table.price(100.0, 100.0, 0.1, 0.2)  # build/load outside the timing
+
+    table_price_time, lookup_price = _best_time(lambda: table.price(S, K, T, sigma, is_call))
+    table_time, lookup = _best_time(lambda: table.greeks(S, K, T, sigma, is_call))
+    closed_price_time, exact_price = _best_time(lambda: bs_price(S, K, T, table.r, sigma, is_call))
+    closed_greeks_time, exact = _best_time(lambda: bs_greeks(S, K, T, table.r, sigma, is_call))
+
+    # Single quote, as in a quoting loop
+    table_single_time, _ = _best_time(lambda: table.price(101.0, 100.0, 0.1, 0.2, "call"), number=10_000)
+    closed_single_time, _ = _best_time(lambda: bs_price(101.0, 100.0, 0.1, table.r, 0.2, True), number=10_000)
+
+    print(f"Table shape: {table.table.shape}, {table.table.nbytes / 1e6:.1f} MB")
+    print(f"Table lookup, price:          {table_price_time * 1000:.1f} ms")
+    print(f"Table lookup, price + greeks: {table_time * 1000:.1f} ms")
+    print(f"Closed form, price:           {closed_price_time * 1000:.1f} ms")
+    print(f"Closed form, price + greeks:  {closed_greeks_time * 1000:.1f} ms")
+    print(f"Table lookup, single quote:   {table_single_time * 1e6:.1f} us")
+    print(f"Closed form, single quote:    {closed_single_time * 1e6:.1f} us")
+    print(f"Max price error: {np.abs(lookup_price - exact_price).max():.2e}")
+    for name in ["delta", "gamma", "vega", "theta"]:
+        print(f"Max {name} error: {np.abs(lookup[name] - exact[name]).max():.2e}")
+
+
+if __name__ == "__main__":
+    benchmark(PriceTable())
@@ -0,0 +1,167 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from greeks import bs_price, greeks_from_d1
+
+GREEKS = ["value", "delta", "gamma", "vega", "theta", "rho"]
+
+
+class OptionBook:
+    def __init__(self):
+        self.positions = []
+
+    def add(self, underlying, option_type, strike, days_till_expiration, quantity, sigma, multiplier=100):
+        if option_type not in ("call", "put"):
+            raise ValueError(f"Invalid option type: {option_type}")
+        if days_till_expiration <= 0:
+            raise ValueError("days_till_expiration must be positive")
+
+        self.positions.append({
+            "underlying": underlying,
+            "option_type": option_type,
+            "strike": float(strike),
+            "T": days_till_expiration / 252,
+            "quantity": quantity * multiplier,
+            "sigma": float(sigma),
+        })
+        return self
+
+    def to_frame(self):
+        return pd.DataFrame(self.positions)
+
+
+class RiskEngine:
+    def __init__(self, book, spots, risk_free_rate=0.03):
+        positions = book.to_frame()
+        if positions.empty:
+            raise ValueError("Option book is empty")
+
+        missing = set(positions["underlying"]) - set(spots)
+        if missing:
+            raise ValueError(f"No spot price for: {sorted(missing)}")
+
+        self.r = risk_free_rate
+        self.underlyings = sorted(spots)
+        self.spots = np.array([spots[u] for u in self.underlyings], dtype=float)
+
+        codes = {u: i for i, u in enumerate(self.underlyings)}
+        self.und = positions["underlying"].map(codes).to_numpy()
+        self.is_call = (positions["option_type"] == "call").to_numpy()
+        self.K = positions["strike"].to_numpy(dtype=float)
+        self.T = positions["T"].to_numpy(dtype=float)
+        self.qty = positions["quantity"].to_numpy(dtype=float)
+        self.sigma = positions["sigma"].to_numpy(dtype=float)
+
+        self._cache_terms()
+        self._greeks = {name: np.zeros(len(self.K)) for name in GREEKS}
+        self.totals = np.zeros((len(self.underlyings), len(GREEKS)))
+        self._reprice(np.ones(len(self.K), dtype=bool))
+
+    def _cache_terms(self):
+        # Everything in d1/d2 that does not depend on spot
+        sqrt_t = np.sqrt(self.T)
+        self._log_k = np.log(self.K)
+        self._sig_sqrt_t = self.sigma * sqrt_t
+        self._drift = (self.r + 0.5 * self.sigma ** 2) * self.T
+        self._disc_k = self.K * np.exp(-self.r * self.T)
+        self._sqrt_t = sqrt_t
+
+    def _reprice(self, mask):
+        S = self.spots[self.und[mask]]
+        sig_sqrt_t = self._sig_sqrt_t[mask]
+        d1 = (np.log(S) - self._log_k[mask] + self._drift[mask]) / sig_sqrt_t
+        values = greeks_from_d1(S, d1, sig_sqrt_t, self._disc_k[mask], self.sigma[mask], self._sqrt_t[mask],
+                                self.T[mask], self.r, self.is_call[mask])
+        values["value"] = values.pop("price")
+
+        qty = self.qty[mask]
+        greeks = self._greeks
+        for name in GREEKS:
+            greeks[name][mask] = qty * values[name]
+
+        # Only the underlyings that moved need their totals rebuilt
+        for u in np.unique(self.und[mask]):
+            in_u = self.und == u
+            self.totals[u] = [greeks[name][in_u].sum() for name in GREEKS]
+
+    def update_spot(self, spots):
+        # Incremental path: only positions on the moved underlyings are repriced,
+        # reusing the cached strike/vol/time terms
+        changed = np.zeros(len(self.underlyings), dtype=bool)
+        for underlying, spot in spots.items():
+            u = self.underlyings.index(underlying)
+            self.spots[u] = spot
+            changed[u] = True
+
+        self._reprice(changed[self.und])
+        return self
+
+    def update_vols(self, sigma):
+        self.sigma = np.broadcast_to(np.asarray(sigma, dtype=float), self.K.shape).copy()
+        self._cache_terms()
+        self._reprice(np.ones(len(self.K), dtype=bool))
+        return self
+
+    def greeks(self):
+        return pd.DataFrame(self.totals, index=pd.Index(self.underlyings, name="underlying"), columns=GREEKS)
+
+    def position_greeks(self):
+        return pd.DataFrame(self._greeks)
+
+    def scenario_grid(self, spot_shocks, vol_shocks=(0.0,), days_forward=(0,), chunk_size=2048):
+        # Full revaluation of the book on a spot x vol x time grid.
+        # spot_shocks: relative moves applied to every underlying (0.05 = +5%)
+        # vol_shocks: absolute vol shifts (0.02 = +2 vol points)
+        # days_forward: trading days elapsed
+        # Returns book PnL versus current value, shape (n_spot, n_vol, n_time).
+        spot_mult = 1.0 + np.asarray(spot_shocks, dtype=float)[:, None, None, None]
+        vol_shift = np.asarray(vol_shocks, dtype=float)[None, :, None, None]
+        dt = np.asarray(days_forward, dtype=float)[None, None, :, None] / 252
+
+        pnl = np.zeros((spot_mult.shape[0], vol_shift.shape[1], dt.shape[2]))
+        # Chunk over positions to bound the size of the broadcast grid
+        for start in range(0, len(self.K), chunk_size):
+            idx = slice(start, start + chunk_size)
+            S = self.spots[self.und[idx]] * spot_mult
+            sigma = np.maximum(self.sigma[idx] + vol_shift, 1e-6)
+            T = self.T[idx] - dt
+            value = bs_price(S, self.K[idx], T, self.r, sigma, self.is_call[idx])
+            pnl += (value * self.qty[idx]).sum(axis=-1)
+
+        return pnl - self.totals[:, 0].sum()
+
+    def delta_gamma_pnl(self, spot_moves):
+        # Second-order PnL estimate for relative spot moves, per underlying
+        dS = self.spots * np.asarray(spot_moves, dtype=float)
+        return self.totals[:, 1] * dS + 0.5 * self.totals[:, 2] * dS ** 2
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    spots = {"AAPL": 190.0, "GOOG": 140.0, "MSFT": 370.0}
+
+    book = OptionBook()
+    for _ in range(5000):
+        underlying = rng.choice(list(spots))
+        book.add(
+            underlying=underlying,
+            option_type=rng.choice(["call", "put"]),
+            strike=spots[underlying] * rng.uniform(0.8, 1.2),
+            days_till_expiration=rng.integers(5, 250),
+            quantity=rng.integers(-10, 11),
+            sigma=rng.uniform(0.15, 0.5),
+        )
+
+    engine = RiskEngine(book, spots)
+    print(engine.greeks())
+
+    start = time.perf_counter()
+    engine.update_spot({"AAPL": 191.5})
+    print(f"Spot update: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    start = time.perf_counter()
+    grid = engine.scenario_grid(np.linspace(-0.1, 0.1, 21), [-0.05, 0.0, 0.05], [0, 1, 5])
+    print(f"Scenario grid {grid.shape}: {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(f"Worst scenario PnL: {grid.min():,.0f}")
@@ -0,0 +1,187 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import load_bars
+
+# Rolling covariance / correlation across a ticker universe, updated one bar at a
+# time in O(n^2) instead of recomputing the whole window.
+
+
+def get_returns(tickers):
+    close = pd.DataFrame({ticker: load_bars(ticker)["Close"] for ticker in tickers})
+    return np.log(close / close.shift(1)).iloc[1:]
+
+
+class RollingCovariance:
+    # Simple-window covariance with pairwise-complete observations (NaN = missing).
+    # The window is kept in a ring buffer; sums for the bar leaving the window are
+    # subtracted and sums for the new bar added. With dtype=np.float32 the
+    # accumulators are rebuilt from the buffer every `refresh` bars to bound drift.
+    def __init__(self, n_assets, window, dtype=np.float64, refresh=None):
+        self.n = n_assets
+        self.window = window
+        self.dtype = np.dtype(dtype)
+        self.refresh = refresh if refresh is not None else (window * 10 if self.dtype == np.float32 else None)
+
+        self.buffer = np.full((window, n_assets), np.nan, dtype=self.dtype)
+        self.head = 0
+        self.updates = 0
+
+        self.count = np.zeros((n_assets, n_assets), dtype=self.dtype)  # rows where both i and j are valid
+        self.sum = np.zeros((n_assets, n_assets), dtype=self.dtype)  # [i, j]: sum of x_i where j is valid too
+        self.sum_sq = np.zeros((n_assets, n_assets), dtype=self.dtype)  # [i, j]: sum of x_i^2 where j is valid too
+        self.cross = np.zeros((n_assets, n_assets), dtype=self.dtype)  # sum of x_i * x_j
+
+    def _accumulate(self, row, sign):
+        valid = ~np.isnan(row)
+        if not valid.any():
+            return
+        mask = valid.astype(self.dtype)
+        x = np.where(valid, row, 0).astype(self.dtype)
+
+        self.count += sign * np.outer(mask, mask)
+        self.sum += sign * np.outer(x, mask)
+        self.sum_sq += sign * np.outer(x * x, mask)
+        self.cross += sign * np.outer(x, x)
+
+    def _rebuild(self):
+        # Exact sums from the buffer, accumulated in float64
+        valid = ~np.isnan(self.buffer)
+        mask = valid.astype(np.float64)
+        x = np.where(valid, self.buffer, 0).astype(np.float64)
+        self.count[:] = mask.T @ mask
+        self.sum[:] = x.T @ mask
+        self.sum_sq[:] = (x * x).T @ mask
+        self.cross[:] = x.T @ x
+
+    def update(self, row):
+        row = np.asarray(row, dtype=self.dtype)
+        self._accumulate(self.buffer[self.head], -1)
+        self.buffer[self.head] = row
+        self._accumulate(row, 1)
+
+        self.head = (self.head + 1) % self.window
+        self.updates += 1
+        if self.refresh and self.updates % self.refresh == 0:
+            self._rebuild()
+        return self
+
+    def covariance(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = (self.cross - self.sum * self.sum.T / self.count) / (self.count - 1)
+        cov[self.count < 2] = np.nan
+        return cov
+
+    def correlation(self):
+        # Variances over the same pairwise-complete rows as the covariance
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centered = self.cross - self.sum * self.sum.T / self.count
+            var_i = self.sum_sq - self.sum ** 2 / self.count
+            corr = centered / np.sqrt(var_i * var_i.T)
+        corr[self.count < 2] = np.nan
+        return np.clip(corr, -1, 1)
+
+
+class EWMCovariance:
+    # Exponentially weighted covariance, O(n^2) per bar and no window buffer.
+    # Assets missing on a bar keep their mean and covariance entries unchanged.
+    def __init__(self, n_assets, span=None, halflife=None, dtype=np.float64, min_periods=2):
+        if (span is None) == (halflife is None):
+            raise ValueError("Pass exactly one of span or halflife")
+        self.alpha = 2 / (span + 1) if span is not None else 1 - np.exp(-np.log(2) / halflife)
+        self.min_periods = min_periods
+
+        self.mean = np.full(n_assets, np.nan, dtype=dtype)
+        self.cov = np.zeros((n_assets, n_assets), dtype=dtype)
+        self.counts = np.zeros(n_assets, dtype=np.int64)
+
+    def update(self, row):
+        row = np.asarray(row, dtype=self.cov.dtype)
+        valid = ~np.isnan(row)
+        first = valid & (self.counts == 0)
+        self.mean[first] = row[first]
+
+        diff = np.where(valid, row - self.mean, 0)
+        both = np.outer(valid, valid)
+        updated = (1 - self.alpha) * (self.cov + self.alpha * np.outer(diff, diff))
+        self.cov = np.where(both, updated, self.cov)
+        self.mean = np.where(valid, self.mean + self.alpha * diff, self.mean)
+        self.counts += valid
+        return self
+
+    def covariance(self):
+        cov = self.cov.copy()
+        ready = self.counts >= self.min_periods
+        cov[~np.outer(ready, ready)] = np.nan
+        return cov
+
+    def correlation(self):
+        cov = self.covariance()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.clip(cov / np.outer(std, std), -1, 1)
+
+
+def rolling_matrix_history(returns, window=None, span=None, halflife=None, kind="correlation",
+                           low_memory=False, path=None):
+    # Runs an engine over every bar of a date x ticker returns frame and stores one
+    # matrix per date. low_memory=True keeps float32 accumulators and stores only
+    # the upper triangle (n(n+1)/2 values per date); pass path to write the
+    # history to a memory-mapped .npy file instead of RAM.
+    values = returns.to_numpy(dtype=np.float64)
+    n_dates, n_assets = values.shape
+    dtype = np.float32 if low_memory else np.float64
+
+    if window is not None:
+        engine = RollingCovariance(n_assets, window, dtype=dtype)
+    else:
+        engine = EWMCovariance(n_assets, span=span, halflife=halflife, dtype=dtype)
+
+    if low_memory:
+        rows, cols = np.triu_indices(n_assets)
+        shape = (n_dates, len(rows))
+    else:
+        shape = (n_dates, n_assets, n_assets)
+
+    if path is not None:
+        history = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    else:
+        history = np.empty(shape, dtype=dtype)
+
+    for t in range(n_dates):
+        engine.update(values[t])
+        matrix = engine.correlation() if kind == "correlation" else engine.covariance()
+        history[t] = matrix[rows, cols] if low_memory else matrix
+
+    if path is not None:
+        history.flush()
+    return history
+
+
+def unpack_upper(packed, n_assets):
+    # Rebuild the full symmetric matrix from a low_memory history row
+    rows, cols = np.triu_indices(n_assets)
+    matrix = np.empty((n_assets, n_assets), dtype=packed.dtype)
+    matrix[rows, cols] = packed
+    matrix[cols, rows] = packed
+    return matrix
+
+
+if __name__ == "__main__":
+    tickers = ["AAPL", "GOOG", "MSFT"]
+    returns = get_returns(tickers)
+
+    rolling = RollingCovariance(len(tickers), window=60)
+    ewm = EWMCovariance(len(tickers), span=60)
+    for row in returns.to_numpy():
+        rolling.update(row)
+        ewm.update(row)
+
+    print("60-day rolling correlation:")
+    print(pd.DataFrame(rolling.correlation(), index=tickers, columns=tickers).round(3))
+    print("EWM (span 60) correlation:")
+    print(pd.DataFrame(ewm.correlation(), index=tickers, columns=tickers).round(3))
@@ -1,21 +1,16 @@
-import yfinance as yf
-import pandas as pd
-import numpy as np
+import os
+import sys
+
 import plotly.graph_objects as go
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import load_bars
+
 def get_stock_data(tickers, start, end):
     data = {}
 
     for ticker in tickers:
-        try:
-            df = pd.read_csv(f"../CSVs/{ticker}_returns.csv", index_col=0, parse_dates=True)
-            data[ticker] = df
-        except Exception as e:
-            print(f"Error: {e}")
-
-            df = yf.download(ticker, start=start, end=end)
-            data[ticker] = df
-            df.to_csv(f"../CSVs/{ticker}_returns.csv")
+        data[ticker] = load_bars(ticker, start=start, end=end)
 
     return data
 
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+# Single ingestion step for the advent scripts. Bars are parsed, typed and
+# checked once here; the calculate_* stages trust the result and add their
+# columns to it in place instead of re-coercing Close and dropping rows.
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CSVs")
+
+
+def read_bars(path):
+    # yfinance writes a (Price, Ticker) two-row header plus a "Date" row
+    with open(path) as f:
+        f.readline()
+        second = f.readline()
+
+    if second.startswith("Ticker"):
+        df = pd.read_csv(path, header=[0, 1], index_col=0, parse_dates=True)
+        df = df.droplevel(1, axis=1)
+    else:
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+    return df
+
+
+def validate_bars(df):
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel(1, axis=1)
+
+    missing = [column for column in BAR_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Bars are missing columns: {missing}")
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError(f"Bars need a DatetimeIndex, got {type(df.index).__name__}")
+
+    # One typed, contiguous copy; everything downstream works on it in place
+    bars = pd.DataFrame(
+        {column: pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64) for column in BAR_COLUMNS},
+        index=df.index,
+    )
+    bars = bars[bars["Close"].notna().to_numpy()]
+    if not bars.index.is_monotonic_increasing:
+        bars = bars.sort_index()
+    if bars.index.has_duplicates:
+        bars = bars[~bars.index.duplicated(keep="last")]
+
+    if bars.empty:
+        raise ValueError("No bars with a Close price")
+    return bars
+
+
+def load_bars(ticker, start=None, end=None, csv_dir=CSV_DIR):
+    path = os.path.join(csv_dir, f"{ticker}_returns.csv")
+    if os.path.exists(path):
+        return validate_bars(read_bars(path))
+
+    # Only bars that pass validation are stored, so a failed download is never cached
+    df = yf.download(ticker, start=start, end=end)
+    bars = validate_bars(df)
+    df.to_csv(path)
+    return bars
+
+
+def trim_warmup(data):
+    # Drop the leading rows where any indicator is still warming up, once, at the end of a chain
+    complete = data.notna().all(axis=1).to_numpy()
+    if not complete.any():
+        return data.iloc[:0]
+    return data.iloc[int(complete.argmax()):]
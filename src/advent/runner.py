@@ -0,0 +1,97 @@
+import importlib
+import os
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ingest import CSV_DIR, load_bars, trim_warmup
+
+# Runs a pipeline of the per-ticker stages over a ticker list on a process pool.
+# Only the ticker and the stage names cross the process boundary: each worker
+# loads its bars from the local CSV store itself. Results come back in the
+# order of the ticker list, and a failing ticker is reported with its traceback
+# without stopping the others.
+
+ADVENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# black_scholes.py carries all four stages
+STAGE_MODULE = "black_scholes"
+STAGE_PATH = os.path.join(ADVENT_DIR, "black_scholes")
+
+DEFAULT_PIPELINE = [
+    "add_moving_average_strategy",
+    "calculate_indicators",
+    "calculate_volatility",
+    "calculate_option_price_bs",
+]
+
+TickerResult = namedtuple("TickerResult", ["ticker", "data", "error", "seconds"])
+
+
+def _init_worker(paths):
+    for path in paths:
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def _resolve(stage):
+    # A stage is a function name, or (name, kwargs) for non-default arguments
+    name, kwargs = (stage, {}) if isinstance(stage, str) else stage
+    return getattr(importlib.import_module(STAGE_MODULE), name), kwargs
+
+
+def _run_ticker(ticker, pipeline, start, end, csv_dir, trim):
+    began = time.perf_counter()
+    try:
+        data = load_bars(ticker, start=start, end=end, csv_dir=csv_dir)
+        for stage in pipeline:
+            func, kwargs = _resolve(stage)
+            data = func(data, **kwargs)
+        if trim:
+            data = trim_warmup(data)
+        return TickerResult(ticker, data, None, time.perf_counter() - began)
+    except Exception:
+        return TickerResult(ticker, None, traceback.format_exc(), time.perf_counter() - began)
+
+
+def _run_pool(tickers, pipeline, start, end, csv_dir, trim, max_workers):
+    # Results in input order, plus the positions lost to a worker dying (crash,
+    # OOM kill), which breaks the pool and fails every task still in flight
+    results, broken = [], []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=([ADVENT_DIR, STAGE_PATH],)) as pool:
+        futures = [pool.submit(_run_ticker, ticker, pipeline, start, end, csv_dir, trim) for ticker in tickers]
+        for i, (ticker, future) in enumerate(zip(tickers, futures)):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                broken.append(i)
+                results.append(TickerResult(ticker, None, traceback.format_exc(), 0.0))
+    return results, broken
+
+
+def run(tickers, pipeline=DEFAULT_PIPELINE, start=None, end=None, csv_dir=CSV_DIR, trim=True, max_workers=None):
+    pipeline = list(pipeline)
+    results, broken = _run_pool(tickers, pipeline, start, end, csv_dir, trim, max_workers)
+
+    # Rerun the tickers a dead worker took down one at a time, so only the one
+    # that kills its own worker keeps the BrokenProcessPool error
+    for i in broken:
+        results[i] = _run_pool([tickers[i]], pipeline, start, end, csv_dir, trim, 1)[0][0]
+    return results
+
+
+if __name__ == "__main__":
+    tickers = ["AAPL", "GOOG", "MSFT"]
+
+    began = time.perf_counter()
+    results = run(tickers, start="2023-01-01", end="2024-11-01")
+    print(f"{len(tickers)} tickers in {time.perf_counter() - began:.2f} s")
+
+    for result in results:
+        if result.error:
+            print(f"{result.ticker}: failed\n{result.error}")
+        else:
+            print(f"{result.ticker}: {len(result.data)} rows in {result.seconds * 1000:.1f} ms")
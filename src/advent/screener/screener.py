@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+# Cross-sectional screening: every metric is a date x ticker frame computed in
+# one vectorized pass over the whole universe.
+
+
+def get_universe(path="../../starter_files/sp_500_stocks.csv"):
+    return pd.read_csv(path)["Ticker"].dropna().str.replace(".", "-", regex=False).tolist()
+
+
+def _download_close(tickers, start, end):
+    data = yf.download(tickers, start=start, end=end, auto_adjust=True, progress=False)
+    return data["Close"].reindex(columns=tickers).astype(float)
+
+
+def get_close_prices(tickers, start, end, cache="../CSVs/universe_close.csv"):
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    close = pd.read_csv(cache, index_col=0, parse_dates=True) if os.path.exists(cache) else None
+
+    # Allow a few days of slack at each end for weekends and holidays
+    slack = pd.Timedelta(days=5)
+    covered = (
+        close is not None and len(close)
+        and close.index[0] <= start + slack and close.index[-1] >= end - pd.Timedelta(days=1) - slack
+    )
+
+    if covered:
+        missing = sorted(set(tickers) - set(close.columns))
+        if missing:
+            print(f"Downloading {len(missing)} tickers missing from {cache}")
+            close = close.join(_download_close(missing, start, end), how="outer")
+            close.to_csv(cache)
+    else:
+        if close is not None:
+            print(f"{cache} does not cover {start.date()} to {end.date()}, downloading {len(tickers)} tickers")
+        downloaded = _download_close(tickers, start, end)
+        close = downloaded if close is None else downloaded.combine_first(close)
+        close.to_csv(cache)
+
+    return close.loc[(close.index >= start) & (close.index < end), tickers]
+
+
+def compute_metrics(close, momentum_window=126, skip_window=21, rsi_window=14, vol_window=20,
+                    short_window=20, long_window=50):
+    # Momentum over momentum_window, skipping the most recent skip_window days
+    momentum = close.shift(skip_window) / close.shift(momentum_window) - 1
+
+    # Same RSI definition as calculate_indicators, applied to all tickers at once
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=rsi_window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_window).mean()
+    rsi = 100 - (100 / (1 + gain / loss))
+
+    realized_vol = np.log(close).diff().rolling(window=vol_window).std() * np.sqrt(252)
+
+    # 1 = short MA above long MA, -1 = below; crossover marks the day the state flips
+    short_ma = close.rolling(window=short_window).mean()
+    long_ma = close.rolling(window=long_window).mean()
+    ma_state = np.sign(short_ma - long_ma)
+    ma_crossover = ma_state.where(ma_state.ne(ma_state.shift()) & ma_state.shift().notna(), 0)
+
+    return {
+        "close": close,
+        "momentum": momentum,
+        "rsi": rsi,
+        "realized_vol": realized_vol,
+        "ma_state": ma_state,
+        "ma_crossover": ma_crossover,
+    }
+
+
+def score(metrics, momentum_weight=0.7, vol_weight=0.3, min_price=5.0, max_vol=0.8,
+          rsi_range=(30, 70), require_uptrend=True):
+    # Cross-sectional percentile ranks: high momentum and low vol score best
+    momentum_rank = metrics["momentum"].rank(axis=1, pct=True)
+    vol_rank = metrics["realized_vol"].rank(axis=1, pct=True, ascending=False)
+    composite = momentum_weight * momentum_rank + vol_weight * vol_rank
+
+    eligible = (
+        (metrics["close"] >= min_price)
+        & (metrics["realized_vol"] <= max_vol)
+        & (metrics["rsi"] >= rsi_range[0])
+        & (metrics["rsi"] <= rsi_range[1])
+    )
+    if require_uptrend:
+        eligible &= metrics["ma_state"] == 1
+
+    return composite.where(eligible)
+
+
+def top_n(scores, n=10):
+    # Top-N tickers for every date in one argsort over the date x ticker matrix
+    values = scores.to_numpy(dtype=float)
+    filled = np.where(np.isnan(values), -np.inf, values)
+
+    n = min(n, filled.shape[1])
+    best = np.argpartition(-filled, n - 1, axis=1)[:, :n]
+    order = np.argsort(-np.take_along_axis(filled, best, axis=1), axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+    best_scores = np.take_along_axis(filled, best, axis=1)
+
+    result = pd.DataFrame({
+        "Date": np.repeat(scores.index.to_numpy(), n),
+        "Rank": np.tile(np.arange(1, n + 1), len(scores)),
+        "Ticker": scores.columns.to_numpy()[best.ravel()],
+        "Score": best_scores.ravel(),
+    })
+    return result[np.isfinite(result["Score"])].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    start = "2023-01-01"
+    end = "2024-11-01"
+
+    tickers = get_universe()
+    close = get_close_prices(tickers, start, end)
+
+    metrics = compute_metrics(close)
+    picks = top_n(score(metrics), n=10)
+
+    last_date = picks["Date"].max()
+    print(f"Top picks on {last_date:%Y-%m-%d}:")
+    print(picks[picks["Date"] == last_date].to_string(index=False))
@@ -1,9 +1,13 @@
-import yfinance as yf
-import pandas as pd
+import os
+import sys
+
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import load_bars, trim_warmup
+
 # Add Moving Average Cross strat
 def add_strategy(data, short_window=20, long_window=50):
     data['Short_MA'] = data['Close'].rolling(window=short_window).mean()
@@ -23,32 +27,18 @@ def get_stock_data(tickers, start, end):
     data = {}
 
     for ticker in tickers:
-        try:
-            df = pd.read_csv(f"../CSVs/{ticker}_returns.csv", index_col=0, parse_dates=True)
-            data[ticker] = df
-        except Exception as e:
-            print(f"Error: {e}")
-
-            df = yf.download(ticker, start=start, end=end)
-            data[ticker] = df
-            df.to_csv(f"../CSVs/{ticker}_returns.csv")
+        data[ticker] = load_bars(ticker, start=start, end=end)
 
     return data
 
 def add_moving_average_strategy(data, short_window=20, long_window=50):
-    # Convert Close column to numeric
-    data["Close"] = pd.to_numeric(data["Close"], errors="coerce")
-
-    # Drop rows where Close could not be converted
-    data = data.dropna(subset=["Close"])
+    # Expects bars from load_bars: Close is already numeric and complete
 
     # Compute moving averages
     data["Short_MA"] = data["Close"].rolling(window=short_window).mean()
     data["Long_MA"] = data["Close"].rolling(window=long_window).mean()
 
-    data = data.dropna()
-
-    # Generate buy/sell/hold signals
+    # Generate buy/sell/hold signals (warmup rows compare against NaN and stay 0)
     data["Signal"] = np.where(
         (data["Short_MA"] > data["Long_MA"]) & (data["Short_MA"].shift(1) <= data["Long_MA"].shift(1)), 1,
         np.where(
@@ -67,10 +57,10 @@ def calculate_indicators(data):
     data["RSI"] = 100 - (100 / (1 + rs))
 
     data["MA_20"] = data["Close"].rolling(window=20).mean()
-    data["Upper_Band"] = data["MA_20"] + 2 * data["Close"].rolling(window=20).std()
-    data["Lower_Band"] = data["MA_20"] - 2 * data["Close"].rolling(window=20).std()
+    std_20 = data["Close"].rolling(window=20).std()
+    data["Upper_Band"] = data["MA_20"] + 2 * std_20
+    data["Lower_Band"] = data["MA_20"] - 2 * std_20
 
-    data = data.dropna()
     return data
 
 def plot(data, ticker):
@@ -161,7 +151,6 @@ def calculate_volatility(data):
     data["EWMA_Std"] = data["Rolling_Std"].ewm(span=20).std()
     data["Annualized_Vol"] = data["Rolling_Std"] * np.sqrt(252)
 
-    data = data.dropna()
     return data
 
 if __name__ == "__main__":
@@ -175,4 +164,5 @@ if __name__ == "__main__":
         data = add_moving_average_strategy(data)
         data = calculate_indicators(data)
         data = calculate_volatility(data)
+        data = trim_warmup(data)
         plot_with_strategy(data, ticker)
\ No newline at end of file
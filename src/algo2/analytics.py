@@ -0,0 +1,81 @@
+import numpy as np
+
+HOURS_PER_YEAR = 252 * 24
+
+# All metrics reduce over the last axis, so a (runs x bars) or (runs x trades)
+# array scores a whole sweep in one call. Pad ragged trade lists with NaN.
+
+
+def bar_pnl(trades, n_bars):
+    # Realized PnL (pips) booked on each trade's exit bar
+    return np.bincount(trades["exit_index"], weights=trades["pnl_pips"], minlength=n_bars)
+
+
+def sharpe_ratio(returns, periods_per_year=HOURS_PER_YEAR):
+    returns = np.asarray(returns, dtype=float)
+    std = np.nanstd(returns, axis=-1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.nanmean(returns, axis=-1) / std * np.sqrt(periods_per_year)
+
+
+def sortino_ratio(returns, periods_per_year=HOURS_PER_YEAR):
+    returns = np.asarray(returns, dtype=float)
+    downside = np.sqrt(np.nanmean(np.minimum(returns, 0.0) ** 2, axis=-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.nanmean(returns, axis=-1) / downside * np.sqrt(periods_per_year)
+
+
+def max_drawdown(returns, compounded=False):
+    # compounded=False: additive PnL (pips), drawdown in the same units
+    # compounded=True: fractional returns, drawdown as a fraction of the peak
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    if compounded:
+        equity = np.cumprod(1 + returns, axis=-1)
+        peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=-1)
+        return np.max(1 - equity / peak, axis=-1)
+
+    equity = np.cumsum(returns, axis=-1)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=-1)
+    return np.max(peak - equity, axis=-1)
+
+
+def win_rate(pnl):
+    pnl = np.asarray(pnl, dtype=float)
+    wins = np.sum(pnl > 0, axis=-1)
+    count = np.sum(~np.isnan(pnl), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return wins / count
+
+
+def profit_factor(pnl):
+    pnl = np.asarray(pnl, dtype=float)
+    gross_profit = np.nansum(np.where(pnl > 0, pnl, 0.0), axis=-1)
+    gross_loss = -np.nansum(np.where(pnl < 0, pnl, 0.0), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return gross_profit / gross_loss
+
+
+def exposure(bars_held, n_bars):
+    # Fraction of bars spent in the market
+    return np.nansum(np.asarray(bars_held, dtype=float), axis=-1) / n_bars
+
+
+def summarize(trades, n_bars, periods_per_year=HOURS_PER_YEAR):
+    pnl = trades["pnl_pips"]
+    per_bar = bar_pnl(trades, n_bars)
+    return {
+        "trades": len(trades),
+        "total_pips": float(pnl.sum()),
+        "sharpe": float(sharpe_ratio(per_bar, periods_per_year)),
+        "sortino": float(sortino_ratio(per_bar, periods_per_year)),
+        "max_drawdown_pips": float(max_drawdown(per_bar)),
+        "win_rate": float(win_rate(pnl)),
+        "profit_factor": float(profit_factor(pnl)),
+        "exposure": float(exposure(trades["bars_held"], n_bars)),
+        "avg_bars_held": float(trades["bars_held"].mean()) if len(trades) else 0.0,
+    }
+
+
+def print_summary(summary):
+    for key, value in summary.items():
+        print(f"{key:>18}: {value:.4f}" if isinstance(value, float) else f"{key:>18}: {value}")
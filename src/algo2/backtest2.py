@@ -2,6 +2,9 @@ import pandas as pd
 from ta.momentum import RSIIndicator
 from ta.volatility import BollingerBands
 
+from analytics import print_summary, summarize
+from ledger import TradeLedger
+
 # Load your historical data CSV (must have 'close' prices and a datetime index)
 # You can export CSV from OANDA or any data provider
 # CSV example columns: time, open, high, low, close, volume
@@ -17,71 +20,57 @@ df["bb_high"] = bb.bollinger_hband()
 TP_PIPS = 0.0030
 SL_PIPS = 0.0020
 
-# Initialize columns to track trades
-df["position"] = 0  # 1 = long, -1 = short, 0 = flat
-df["entry_price"] = 0.0
-df["exit_price"] = 0.0
-df["profit"] = 0.0
+close = df["close"].to_numpy()
+rsi = df["rsi"].to_numpy()
+bb_low = df["bb_low"].to_numpy()
+bb_high = df["bb_high"].to_numpy()
+times = df.index
+
+# One row per round trip instead of sparse columns on the bar frame
+ledger = TradeLedger()
 
 in_position = False
-position_type = 0
+position_type = 0  # 1 = long, -1 = short, 0 = flat
 entry_price = 0.0
+entry_index = 0
 
 for i in range(1, len(df)):
     if not in_position:
         # Check entry conditions
-        if df["rsi"].iloc[i] < 30 and df["close"].iloc[i] < df["bb_low"].iloc[i]:
+        if rsi[i] < 30 and close[i] < bb_low[i]:
             # Enter long
             in_position = True
             position_type = 1
-            entry_price = df["close"].iloc[i]
-            df.at[df.index[i], "position"] = 1
-            df.at[df.index[i], "entry_price"] = entry_price
-        elif df["rsi"].iloc[i] > 70 and df["close"].iloc[i] > df["bb_high"].iloc[i]:
+            entry_price = close[i]
+            entry_index = i
+        elif rsi[i] > 70 and close[i] > bb_high[i]:
             # Enter short
             in_position = True
             position_type = -1
-            entry_price = df["close"].iloc[i]
-            df.at[df.index[i], "position"] = -1
-            df.at[df.index[i], "entry_price"] = entry_price
+            entry_price = close[i]
+            entry_index = i
     else:
         # We are in a trade, check exit conditions (TP or SL hit)
-        current_price = df["close"].iloc[i]
+        current_price = close[i]
+        tp_price = entry_price + position_type * TP_PIPS
+        sl_price = entry_price - position_type * SL_PIPS
 
-        if position_type == 1:
-            tp_price = entry_price + TP_PIPS
-            sl_price = entry_price - SL_PIPS
-            if current_price >= tp_price:
-                # Take Profit hit - close position
-                df.at[df.index[i], "exit_price"] = tp_price
-                df.at[df.index[i], "profit"] = tp_price - entry_price
-                in_position = False
-                position_type = 0
-            elif current_price <= sl_price:
-                # Stop Loss hit - close position
-                df.at[df.index[i], "exit_price"] = sl_price
-                df.at[df.index[i], "profit"] = sl_price - entry_price
-                in_position = False
-                position_type = 0
+        if position_type * (current_price - tp_price) >= 0:
+            exit_price = tp_price  # Take Profit hit - close position
+        elif position_type * (current_price - sl_price) <= 0:
+            exit_price = sl_price  # Stop Loss hit - close position
+        else:
+            continue
 
-        elif position_type == -1:
-            tp_price = entry_price - TP_PIPS
-            sl_price = entry_price + SL_PIPS
-            if current_price <= tp_price:
-                df.at[df.index[i], "exit_price"] = tp_price
-                df.at[df.index[i], "profit"] = entry_price - tp_price
-                in_position = False
-                position_type = 0
-            elif current_price >= sl_price:
-                df.at[df.index[i], "exit_price"] = sl_price
-                df.at[df.index[i], "profit"] = entry_price - sl_price
-                in_position = False
-                position_type = 0
+        ledger.record(times[entry_index], times[i], entry_index, i, position_type, entry_price, exit_price)
+        in_position = False
+        position_type = 0
 
-# Calculate total profit in pips
-total_profit = df["profit"].sum() * 10000  # multiply by pip factor (1 pip = 0.0001 for EUR/USD)
-print(f"Total profit over backtest period: {total_profit:.2f} pips")
+trades = ledger.trades
+summary = summarize(trades, len(df))
 
-# Optional: Save trades to CSV
-df.to_csv("backtest_results.csv")
+print(f"Total profit over backtest period: {summary['total_pips']:.2f} pips")
+print_summary(summary)
 
+# Optional: Save trades to CSV
+ledger.save("backtest_trades.csv")
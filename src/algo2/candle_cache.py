@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pandas as pd
+import oandapyV20.endpoints.instruments as instruments
+
+# Per-instrument ring buffer of completed OHLC candles, memory-mapped from a
+# local .npy file so it survives restarts. refresh() only asks the API for
+# candles newer than the last stored one.
+
+CANDLE_DTYPE = np.dtype([
+    ("time", "i8"),  # candle open time, ns since epoch UTC; 0 = empty slot
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "i8"),
+])
+
+GRANULARITY_SECONDS = {"M1": 60, "M5": 300, "M15": 900, "M30": 1800, "H1": 3600, "H4": 14400, "D": 86400}
+
+PAGE_SIZE = 500
+
+
+def candles_frame(records):
+    # UTC-indexed OHLCV frame from CANDLE_DTYPE records
+    return pd.DataFrame(
+        {name: records[name] for name in ["open", "high", "low", "close", "volume"]},
+        index=pd.to_datetime(records["time"], utc=True),
+    )
+
+
+class CandleCache:
+    def __init__(self, instrument, granularity="H1", capacity=500, cache_dir="candles"):
+        self.instrument = instrument
+        self.granularity = granularity
+        self.capacity = capacity
+
+        if cache_dir is None:
+            self.buffer = np.zeros(capacity, dtype=CANDLE_DTYPE)  # in-memory only
+        else:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, f"{instrument}_{granularity}.npy")
+            if os.path.exists(path):
+                self.buffer = np.load(path, mmap_mode="r+")
+                if self.buffer.dtype != CANDLE_DTYPE or len(self.buffer) != capacity:
+                    self.buffer = None
+            else:
+                self.buffer = None
+            if self.buffer is None:
+                self.buffer = np.lib.format.open_memmap(path, mode="w+", dtype=CANDLE_DTYPE, shape=(capacity,))
+
+        # The newest slot is the one with the largest time; the next write goes after it
+        times = self.buffer["time"]
+        self.last_time = int(times.max())
+        self.head = (int(times.argmax()) + 1) % capacity if self.last_time else 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.buffer["time"]))
+
+    def append(self, candles):
+        added = 0
+        for c in candles:
+            if not c.get("complete", True):
+                continue
+            t = pd.Timestamp(c["time"]).value
+            if t <= self.last_time:
+                continue
+            mid = c["mid"]
+            self.buffer[self.head] = (t, float(mid["o"]), float(mid["h"]), float(mid["l"]), float(mid["c"]), int(c.get("volume", 0)))
+            self.head = (self.head + 1) % self.capacity
+            self.last_time = t
+            added += 1
+
+        if added and isinstance(self.buffer, np.memmap):
+            self.buffer.flush()
+        return added
+
+    def refresh(self, client, now=None):
+        # now (UTC, defaults to the wall clock) sizes the gap since the last stored candle
+        now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+        if now.tz is None:
+            now = now.tz_localize("UTC")
+        gap = (now.value - self.last_time) / 1e9 / GRANULARITY_SECONDS[self.granularity]
+
+        params = {"granularity": self.granularity, "price": "M"}
+        if self.last_time and gap <= self.capacity:
+            params["from"] = pd.Timestamp(self.last_time, tz="UTC").strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            params["count"] = PAGE_SIZE
+        else:
+            # Empty, or the gap is longer than the buffer: only the newest capacity candles matter
+            params["count"] = self.capacity
+
+        added = 0
+        while True:
+            r = instruments.InstrumentsCandles(instrument=self.instrument, params=params)
+            client.request(r)
+            candles = r.response["candles"]
+            added += self.append(candles)
+
+            # A full page after a gap (e.g. a long restart) means there may be more
+            if "from" not in params or len(candles) < params["count"]:
+                return added
+            params["from"] = candles[-1]["time"]
+
+    def records(self):
+        # Stored candles as a structured array, oldest first
+        filled = self.buffer[self.buffer["time"] != 0]
+        return np.sort(filled, order="time")
+
+    def frame(self):
+        return candles_frame(self.records())
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+PIP_FACTOR = 10000  # 1 pip = 0.0001 for EUR/USD
+
+# One row per round trip
+TRADE_DTYPE = np.dtype([
+    ("entry_time", "datetime64[ns]"),
+    ("exit_time", "datetime64[ns]"),
+    ("entry_index", "i8"),
+    ("exit_index", "i8"),
+    ("side", "i1"),  # 1 = long, -1 = short
+    ("entry_price", "f8"),
+    ("exit_price", "f8"),
+    ("pnl_pips", "f8"),
+    ("bars_held", "i4"),
+])
+
+
+def to_datetime64(value):
+    # Ledger times are naive UTC
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts.to_datetime64()
+
+
+class TradeLedger:
+    def __init__(self, capacity=256, pip_factor=PIP_FACTOR):
+        self.pip_factor = pip_factor
+        self._rows = np.zeros(capacity, dtype=TRADE_DTYPE)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def trades(self):
+        # View on the filled part of the buffer, no copy
+        return self._rows[:self._size]
+
+    def record(self, entry_time, exit_time, entry_index, exit_index, side, entry_price, exit_price):
+        if self._size == len(self._rows):
+            self._rows = np.resize(self._rows, 2 * len(self._rows))
+
+        row = self._rows[self._size]
+        row["entry_time"] = to_datetime64(entry_time)
+        row["exit_time"] = to_datetime64(exit_time)
+        row["entry_index"] = entry_index
+        row["exit_index"] = exit_index
+        row["side"] = side
+        row["entry_price"] = entry_price
+        row["exit_price"] = exit_price
+        row["pnl_pips"] = side * (exit_price - entry_price) * self.pip_factor
+        row["bars_held"] = exit_index - entry_index
+        self._size += 1
+
+    def to_frame(self):
+        return pd.DataFrame(self.trades)
+
+    def save(self, path):
+        if str(path).endswith(".npy"):
+            np.save(path, self.trades)
+        else:
+            self.to_frame().to_csv(path, index=False)
+
+    @classmethod
+    def load(cls, path, pip_factor=PIP_FACTOR):
+        if str(path).endswith(".npy"):
+            trades = np.load(path)
+        else:
+            df = pd.read_csv(path, parse_dates=["entry_time", "exit_time"], float_precision="round_trip")
+            trades = np.zeros(len(df), dtype=TRADE_DTYPE)
+            for name in TRADE_DTYPE.names:
+                trades[name] = df[name].to_numpy()
+
+        ledger = cls(capacity=max(len(trades), 1), pip_factor=pip_factor)
+        ledger._rows[:len(trades)] = trades
+        ledger._size = len(trades)
+        return ledger
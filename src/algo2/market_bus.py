@@ -0,0 +1,161 @@
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from candle_cache import CANDLE_DTYPE, CandleCache, candles_frame
+
+# One feed process keeps a CandleCache up to date and publishes each new bar
+# into a shared-memory ring buffer; any number of strategy processes on the
+# same box read bars from it instead of calling the API themselves.
+#
+# Layout: a header (capacity, write_seq) followed by `capacity` slots. Bar n
+# (n = 1, 2, ...) goes to slot n % capacity and carries seq = n. The writer
+# marks a slot -1 while filling it and bumps write_seq only once the slot is
+# complete, so a reader that sees a slot's seq differ from the one it expected
+# knows the bar was overwritten (it fell more than `capacity` bars behind).
+
+HEADER_DTYPE = np.dtype([("capacity", "i8"), ("write_seq", "i8")])
+SLOT_DTYPE = np.dtype([("seq", "i8")] + [(name, CANDLE_DTYPE[name]) for name in CANDLE_DTYPE.names])
+
+
+def bus_name(instrument, granularity="H1"):
+    return f"market_bus_{instrument}_{granularity}"
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the segment with the resource
+        # tracker, which would unlink it when the reader exits; skip that
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None if rtype == "shared_memory" else register(name, rtype)
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class MarketBus:
+    def __init__(self, name, capacity=None):
+        # With a capacity the segment is created (feed side), otherwise attached (reader side)
+        self.name = name
+        self.owner = capacity is not None
+        if self.owner:
+            size = HEADER_DTYPE.itemsize + capacity * SLOT_DTYPE.itemsize
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = _attach(name)
+
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        if self.owner:
+            self.header["capacity"] = capacity
+            self.header["write_seq"] = 0
+        self.capacity = int(self.header["capacity"])
+        self.slots = np.ndarray((self.capacity,), dtype=SLOT_DTYPE, buffer=self.shm.buf, offset=HEADER_DTYPE.itemsize)
+        if self.owner:
+            self.slots["seq"] = 0
+
+    @property
+    def write_seq(self):
+        return int(self.header["write_seq"])
+
+    def publish(self, time, open_, high, low, close, volume=0):
+        seq = self.write_seq + 1
+        slot = seq % self.capacity
+        self.slots[slot] = (-1, time, open_, high, low, close, volume)
+        self.slots["seq"][slot] = seq
+        self.header["write_seq"] = seq
+        return seq
+
+    def read(self, first, last):
+        # Copies bars first..last (inclusive) out of the ring; bars overwritten
+        # before or during the copy are dropped, so the result may start later
+        if last < first:
+            return np.zeros(0, dtype=SLOT_DTYPE)
+        seqs = np.arange(first, last + 1)
+        index = seqs % self.capacity
+        bars = self.slots[index]
+        # seq is checked again after the copy, so a slot rewritten mid-copy is caught too
+        intact = (bars["seq"] == seqs) & (self.slots["seq"][index] == seqs)
+        return bars[intact]
+
+    def close(self):
+        self.header = self.slots = None  # views must go before the buffer
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class BusReader:
+    def __init__(self, name, from_start=False):
+        self.bus = MarketBus(name)
+        self.next_seq = self.oldest() if from_start else self.bus.write_seq + 1
+        self.missed = 0  # bars lost to falling behind the writer
+
+    def oldest(self):
+        return max(self.bus.write_seq - self.bus.capacity + 1, 1)
+
+    def poll(self):
+        # New bars since the last poll, oldest first
+        last = self.bus.write_seq
+        first = max(self.next_seq, self.oldest())
+        bars = self.bus.read(first, last)
+
+        expected = self.next_seq
+        if len(bars):
+            self.missed += int(bars["seq"][0]) - expected
+        elif last >= expected:
+            self.missed += last - expected + 1
+        self.next_seq = max(last + 1, self.next_seq)
+        return bars
+
+    def wait(self, timeout=None, interval=0.05):
+        # Blocks until a bar newer than the last poll is published; False on timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.bus.write_seq < self.next_seq:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+    def frame(self, n=None):
+        # The most recent n bars (all available if None) as a UTC-indexed frame
+        last = self.bus.write_seq
+        first = self.oldest() if n is None else max(last - n + 1, self.oldest())
+        return candles_frame(self.bus.read(first, last))
+
+    def close(self):
+        self.bus.close()
+
+
+def run_feed(client, instrument="EUR_USD", granularity="H1", capacity=500, cache_dir="candles",
+             name=None, poll_seconds=60):
+    cache = CandleCache(instrument, granularity, capacity=capacity, cache_dir=cache_dir)
+    bus = MarketBus(name or bus_name(instrument, granularity), capacity=capacity)
+    print(f"Publishing {instrument} {granularity} on '{bus.name}'")
+
+    last_time = 0
+    try:
+        while True:
+            try:
+                cache.refresh(client)
+            except Exception as e:
+                print(f"Error: {e}")
+
+            # The cached history goes out first, so readers that attach later can warm start
+            records = cache.records()
+            for r in records[records["time"] > last_time]:
+                bus.publish(r["time"], r["open"], r["high"], r["low"], r["close"], r["volume"])
+                last_time = int(r["time"])
+
+            time.sleep(poll_seconds)
+    finally:
+        bus.close()
+
+
+if __name__ == "__main__":
+    import strategy2
+
+    run_feed(strategy2.client, strategy2.INSTRUMENT, "H1", capacity=strategy2.CANDLE_CAPACITY)
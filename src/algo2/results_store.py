@@ -0,0 +1,165 @@
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from ledger import TRADE_DTYPE
+
+# Append-only store for backtest runs. Each run is keyed by a hash of strategy,
+# parameters and data version. Summaries live in an indexed SQLite table and
+# trade ledgers in one .npz per run, one array per ledger column. Queries such as
+# "top 50 Sharpe for EUR_USD H1 in 2024" only touch the index.
+
+SUMMARY_COLUMNS = [
+    "trades", "total_pips", "sharpe", "sortino", "max_drawdown_pips",
+    "win_rate", "profit_factor", "exposure", "avg_bars_held",
+]
+
+
+def run_key(strategy, params, data_version):
+    payload = json.dumps({"strategy": strategy, "params": params, "data_version": data_version},
+                         sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def file_version(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultsStore:
+    def __init__(self, root="results"):
+        self.root = root
+        os.makedirs(os.path.join(root, "ledgers"), exist_ok=True)
+
+        self.db = sqlite3.connect(os.path.join(root, "index.sqlite"))
+        metrics = ", ".join(f"{name} REAL" for name in SUMMARY_COLUMNS)
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_key TEXT PRIMARY KEY,
+                strategy TEXT NOT NULL,
+                params TEXT NOT NULL,
+                data_version TEXT NOT NULL,
+                instrument TEXT,
+                timeframe TEXT,
+                period_start TEXT,
+                period_end TEXT,
+                created TEXT NOT NULL,
+                {metrics}
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS runs_by_market ON runs (instrument, timeframe, period_start)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS runs_by_sharpe ON runs (instrument, timeframe, sharpe)")
+        self.db.commit()
+
+    def _ledger_path(self, key):
+        return os.path.join(self.root, "ledgers", key[:2], f"{key}.npz")
+
+    def has(self, key):
+        return self.db.execute("SELECT 1 FROM runs WHERE run_key = ?", (key,)).fetchone() is not None
+
+    def put(self, key, strategy, params, data_version, summary, trades,
+            instrument=None, timeframe=None, start=None, end=None):
+        if self.has(key):
+            return False  # append-only: a run is never rewritten
+
+        path = self._ledger_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(path, **{name: trades[name] for name in TRADE_DTYPE.names})
+
+        row = {
+            "run_key": key,
+            "strategy": strategy,
+            "params": json.dumps(params, sort_keys=True, default=str),
+            "data_version": data_version,
+            "instrument": instrument,
+            "timeframe": timeframe,
+            "period_start": None if start is None else pd.Timestamp(start).isoformat(),
+            "period_end": None if end is None else pd.Timestamp(end).isoformat(),
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            **{name: summary.get(name) for name in SUMMARY_COLUMNS},
+        }
+        columns = ", ".join(row)
+        placeholders = ", ".join("?" for _ in row)
+        self.db.execute(f"INSERT INTO runs ({columns}) VALUES ({placeholders})", list(row.values()))
+        self.db.commit()
+        return True
+
+    def summary(self, key):
+        df = pd.read_sql_query("SELECT * FROM runs WHERE run_key = ?", self.db, params=(key,))
+        if df.empty:
+            raise KeyError(key)
+        return df.iloc[0].to_dict()
+
+    def trades(self, key):
+        with np.load(self._ledger_path(key)) as columns:
+            trades = np.zeros(len(columns["pnl_pips"]), dtype=TRADE_DTYPE)
+            for name in TRADE_DTYPE.names:
+                trades[name] = columns[name]
+        return trades
+
+    def top(self, metric="sharpe", n=50, instrument=None, timeframe=None, start=None, end=None, strategy=None):
+        if metric not in SUMMARY_COLUMNS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        clauses, args = [], []
+        for column, value in (("instrument", instrument), ("timeframe", timeframe), ("strategy", strategy)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if start is not None:
+            clauses.append("period_start >= ?")
+            args.append(pd.Timestamp(start).isoformat())
+        if end is not None:
+            clauses.append("period_end <= ?")
+            args.append(pd.Timestamp(end).isoformat())
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT * FROM runs {where} ORDER BY {metric} DESC LIMIT ?"
+        return pd.read_sql_query(query, self.db, params=args + [n])
+
+    def run(self, strategy, params, data_version, backtest, **meta):
+        # Skip parameter sets that are already stored; backtest(**params) -> (ledger, summary)
+        key = run_key(strategy, params, data_version)
+        if not self.has(key):
+            ledger, summary = backtest(**params)
+            self.put(key, strategy, params, data_version, summary, ledger.trades, **meta)
+        return key
+
+
+def sweep(store, strategy, grid, data_version, backtest, **meta):
+    # Cartesian product over grid = {"param": [values, ...], ...}
+    names = list(grid)
+    return [
+        store.run(strategy, dict(zip(names, values)), data_version, backtest, **meta)
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+if __name__ == "__main__":
+    import strategy2
+
+    csv_file = "EURUSD_1H.csv"
+    bars = pd.read_csv(csv_file, parse_dates=["time"], index_col="time")
+
+    store = ResultsStore()
+    grid = {
+        "tp_pips": [0.0010, 0.0020, 0.0030, 0.0040, 0.0050],
+        "sl_pips": [0.0010, 0.0015, 0.0020, 0.0030],
+    }
+
+    def backtest(**params):
+        return strategy2.run_backtest(csv_file, trades_file=None, **params)
+
+    sweep(store, "rsi_bb_tp_sl", grid, file_version(csv_file), backtest,
+          instrument=strategy2.INSTRUMENT, timeframe="H1", start=bars.index[0], end=bars.index[-1])
+
+    print(store.top("sharpe", n=10, instrument=strategy2.INSTRUMENT, timeframe="H1")[["params", "trades", "total_pips", "sharpe"]])
@@ -0,0 +1,314 @@
+import contextlib
+import datetime
+import os
+import re
+import types
+
+import numpy as np
+import pandas as pd
+
+from analytics import print_summary, summarize
+from candle_cache import GRANULARITY_SECONDS
+from ledger import PIP_FACTOR, TradeLedger, to_datetime64
+
+# Local stand-in for the OANDA v20 endpoints used by strategy2 and trader:
+# instrument candles and market orders (with TP/SL on fill). Bars come from a
+# CSV on disk and time comes from a VirtualClock, so the live loop in
+# strategy2.run_strategy replays months of trading in seconds.
+
+CANDLES_PATH = re.compile(r"v3/instruments/(?P<instrument>[^/]+)/candles$")
+ORDERS_PATH = re.compile(r"v3/accounts/[^/]+/orders$")
+
+
+class ReplayFinished(Exception):
+    pass
+
+
+class VirtualClock:
+    def __init__(self, start, end=None):
+        self.now = pd.Timestamp(start).to_pydatetime()
+        self.end = None if end is None else pd.Timestamp(end).to_pydatetime()
+        self.next_event = None  # callable returning the next time anything can change
+
+    def sleep(self, seconds):
+        target = self.now + datetime.timedelta(seconds=seconds)
+
+        # Nothing changes between bars, so skip idle polls straight to the next bar close
+        if self.next_event is not None:
+            event = self.next_event()
+            if event is not None and event > target:
+                target = event
+
+        if self.end is not None and target > self.end:
+            self.now = self.end
+            raise ReplayFinished()
+        self.now = target
+
+    def time(self):
+        return self.now.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+    def time_module(self):
+        return types.SimpleNamespace(sleep=self.sleep, time=self.time, monotonic=self.time)
+
+    def datetime_module(self):
+        clock = self
+
+        class VirtualDatetime(datetime.datetime):
+            @classmethod
+            def utcnow(cls):
+                return clock.now
+
+            @classmethod
+            def now(cls, tz=None):
+                if tz is None:
+                    return clock.now
+                return clock.now.replace(tzinfo=datetime.timezone.utc).astimezone(tz)
+
+        return types.SimpleNamespace(
+            datetime=VirtualDatetime, timedelta=datetime.timedelta, timezone=datetime.timezone, date=datetime.date
+        )
+
+
+def load_bars(csv_file):
+    # CSV columns: time, open, high, low, close[, volume]
+    df = pd.read_csv(csv_file, parse_dates=["time"], index_col="time")
+    if df.index.tz is not None:
+        df.index = df.index.tz_convert(None)
+    if "volume" not in df:
+        df["volume"] = 0
+    return df.sort_index()
+
+
+class SimulatedBroker:
+    def __init__(self, bars, clock, instrument="EUR_USD", granularity="H1", spread=0.0, pip_factor=PIP_FACTOR):
+        self.instrument = instrument
+        self.granularity = granularity
+        self.clock = clock
+        self.spread = spread
+        self.ledger = TradeLedger(pip_factor=pip_factor)
+
+        self.times = bars.index.to_numpy(dtype="datetime64[ns]")
+        self.open = bars["open"].to_numpy(dtype=float)
+        self.high = bars["high"].to_numpy(dtype=float)
+        self.low = bars["low"].to_numpy(dtype=float)
+        self.close = bars["close"].to_numpy(dtype=float)
+        self.bar_length = np.timedelta64(GRANULARITY_SECONDS[granularity], "s")
+        self.close_times = self.times + self.bar_length
+
+        # Candle payloads are formatted once, requests just slice them
+        self.candles = [
+            {
+                "complete": True,
+                "volume": int(volume),
+                "time": pd.Timestamp(t).strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+                "mid": {"o": f"{o:.5f}", "h": f"{h:.5f}", "l": f"{l:.5f}", "c": f"{c:.5f}"},
+            }
+            for t, o, h, l, c, volume in zip(self.times, self.open, self.high, self.low, self.close, bars["volume"])
+        ]
+
+        self.open_trades = []
+        self.processed = 0  # bars already checked for TP/SL
+        self.balance = 0.0
+        self.last_id = 0
+
+        clock.next_event = self.next_bar_close
+
+    def completed_bars(self):
+        return int(np.searchsorted(self.close_times, np.datetime64(self.clock.now, "ns"), side="right"))
+
+    def next_bar_close(self):
+        i = self.completed_bars()
+        if i >= len(self.close_times):
+            return None
+        return pd.Timestamp(self.close_times[i]).to_pydatetime()
+
+    # --- endpoint dispatch, same contract as oandapyV20.API.request ---
+
+    def request(self, endpoint):
+        path = str(endpoint)
+        method = endpoint.method.upper()
+
+        if method == "GET" and CANDLES_PATH.match(path):
+            response = self._candles(CANDLES_PATH.match(path).group("instrument"), getattr(endpoint, "params", None) or {})
+        elif method == "POST" and ORDERS_PATH.match(path):
+            response = self._create_order(endpoint.data["order"])
+        else:
+            raise NotImplementedError(f"Simulated broker does not support {method} {path}")
+
+        endpoint.response = response
+        endpoint.status_code = endpoint.expected_status
+        return response
+
+    def _candles(self, instrument, params):
+        if instrument != self.instrument:
+            raise ValueError(f"No bars loaded for {instrument}")
+        if params.get("granularity", "S5") != self.granularity:
+            raise ValueError(f"Bars loaded at {self.granularity}, requested {params.get('granularity')}")
+
+        self._advance()
+        end = self.completed_bars()
+        count = int(params.get("count", 500))
+
+        if "from" in params:
+            start = int(np.searchsorted(self.times, to_datetime64(params["from"])))
+            if "to" in params:
+                end = min(end, int(np.searchsorted(self.times, to_datetime64(params["to"]))))
+            else:
+                end = min(end, start + count)
+        else:
+            start = max(end - count, 0)
+
+        return {"instrument": instrument, "granularity": self.granularity, "candles": self.candles[start:end]}
+
+    def _create_order(self, order):
+        if order["instrument"] != self.instrument:
+            raise ValueError(f"No bars loaded for {order['instrument']}")
+        if order.get("type", "MARKET") != "MARKET":
+            raise NotImplementedError("Simulated broker only fills MARKET orders")
+
+        self._advance()
+        bar = self.completed_bars() - 1
+        if bar < 0:
+            raise ValueError("No completed bar to fill against yet")
+
+        units = int(order["units"])
+        side = 1 if units > 0 else -1
+        price = self.close[bar] + side * self.spread / 2
+        now = self.clock.now
+
+        # positionFill DEFAULT: reduce opposite trades first-in-first-out
+        remaining = abs(units)
+        closed = []
+        for trade in list(self.open_trades):
+            if remaining == 0 or trade["side"] == side:
+                continue
+            size = min(remaining, trade["units"])
+            self._close(trade, size, price, now, bar)
+            closed.append({"tradeID": trade["id"], "units": str(-trade["side"] * size), "price": f"{price:.5f}"})
+            remaining -= size
+
+        fill = {
+            "id": self._next_id(),
+            "type": "ORDER_FILL",
+            "time": now.strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+            "instrument": self.instrument,
+            "units": str(units),
+            "price": f"{price:.5f}",
+        }
+        if closed:
+            fill["tradesClosed"] = closed
+        if remaining:
+            trade = {
+                "id": fill["id"],
+                "side": side,
+                "units": remaining,
+                "price": price,
+                "time": now,
+                "bar": bar,
+                "take_profit": float(order["takeProfitOnFill"]["price"]) if "takeProfitOnFill" in order else None,
+                "stop_loss": float(order["stopLossOnFill"]["price"]) if "stopLossOnFill" in order else None,
+            }
+            self.open_trades.append(trade)
+            fill["tradeOpened"] = {"tradeID": trade["id"], "units": str(side * remaining), "price": f"{price:.5f}"}
+
+        return {
+            "orderCreateTransaction": {"id": fill["id"], "type": "MARKET_ORDER", **order},
+            "orderFillTransaction": fill,
+            "lastTransactionID": fill["id"],
+        }
+
+    # --- fills ---
+
+    def _advance(self):
+        # Check TP/SL of open trades on every bar completed since the last call
+        end = self.completed_bars()
+        for i in range(self.processed, end):
+            for trade in list(self.open_trades):
+                if i <= trade["bar"]:
+                    continue
+                exit_price = self._exit_price(trade, self.high[i], self.low[i])
+                if exit_price is not None:
+                    exit_time = pd.Timestamp(self.close_times[i]).to_pydatetime()
+                    self._close(trade, trade["units"], exit_price, exit_time, i)
+        self.processed = max(self.processed, end)
+
+    @staticmethod
+    def _exit_price(trade, high, low):
+        # Both levels inside one bar: assume the stop filled first
+        sl, tp = trade["stop_loss"], trade["take_profit"]
+        if trade["side"] == 1:
+            if sl is not None and low <= sl:
+                return sl
+            if tp is not None and high >= tp:
+                return tp
+        else:
+            if sl is not None and high >= sl:
+                return sl
+            if tp is not None and low <= tp:
+                return tp
+        return None
+
+    def _close(self, trade, units, price, time, bar):
+        self.ledger.record(trade["time"], time, trade["bar"], bar, trade["side"], trade["price"], price)
+        self.balance += trade["side"] * (price - trade["price"]) * units
+        trade["units"] -= units
+        if trade["units"] == 0:
+            self.open_trades.remove(trade)
+
+    def _next_id(self):
+        self.last_id += 1
+        return str(self.last_id)
+
+
+@contextlib.contextmanager
+def patched(module, broker, clock):
+    # Swap the module's API client, time and datetime for the simulated ones, and
+    # start any candle cache empty and in memory so the replay never sees stored or live bars
+    replacements = {
+        "client": broker,
+        "time": clock.time_module(),
+        "datetime": clock.datetime_module(),
+        "candle_cache": None,
+        "CANDLE_CACHE_DIR": None,
+        "MARKET_BUS": None,
+    }
+    saved = {name: getattr(module, name) for name in replacements if hasattr(module, name)}
+    for name in saved:
+        setattr(module, name, replacements[name])
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def replay(module, csv_file, entry="run_strategy", start=None, end=None, quiet=True, **broker_kwargs):
+    bars = load_bars(csv_file)
+    granularity = broker_kwargs.get("granularity", "H1")
+    bar_length = pd.Timedelta(seconds=GRANULARITY_SECONDS[granularity])
+    start = bars.index[0] + bar_length if start is None else pd.Timestamp(start)
+    end = bars.index[-1] + bar_length if end is None else pd.Timestamp(end)
+
+    clock = VirtualClock(start, end)
+    broker = SimulatedBroker(bars, clock, **broker_kwargs)
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patched(module, broker, clock))
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        try:
+            getattr(module, entry)()
+        except ReplayFinished:
+            pass
+
+    clock.now = end
+    broker._advance()
+    return broker
+
+
+if __name__ == "__main__":
+    import strategy2
+
+    broker = replay(strategy2, "EURUSD_1H.csv", instrument=strategy2.INSTRUMENT)
+    print(f"Replayed {broker.processed} bars, {len(broker.ledger)} closed trades, {len(broker.open_trades)} still open")
+    print_summary(summarize(broker.ledger.trades, broker.processed))
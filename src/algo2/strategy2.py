@@ -2,11 +2,15 @@ import time
 import datetime
 import oandapyV20
 import oandapyV20.endpoints.orders as orders
-import oandapyV20.endpoints.instruments as instruments
 import pandas as pd
 from ta.momentum import RSIIndicator
 from ta.volatility import BollingerBands
 
+from analytics import print_summary, summarize
+from candle_cache import CandleCache
+from ledger import TradeLedger
+from market_bus import BusReader
+
 # === CONFIG ===
 API_KEY_PRACTICE = "YOUR_OANDA_PRACTICE_API_KEY"
 API_KEY_LIVE = "YOUR_OANDA_LIVE_API_KEY"
@@ -19,22 +23,31 @@ INSTRUMENT = "EUR_USD"
 UNITS = 1000
 TP_PIPS = 0.0030  # 30 pips
 SL_PIPS = 0.0020  # 20 pips
+CANDLE_CAPACITY = 500
+CANDLE_CACHE_DIR = "candles"  # None keeps the candle buffer in memory only
+MARKET_BUS = None  # name of a running market_bus feed to read candles from instead of the API
 
 ACCOUNT_ID = ACCOUNT_ID_PRACTICE if USE_PAPER else ACCOUNT_ID_LIVE
 API_KEY = API_KEY_PRACTICE if USE_PAPER else API_KEY_LIVE
 client = oandapyV20.API(access_token=API_KEY)
+candle_cache = None
+bus_reader = None
 
 def fetch_candles():
-    params = {"granularity": "H1", "count": 100, "price": "M"}
-    r = instruments.InstrumentsCandles(instrument=INSTRUMENT, params=params)
-    client.request(r)
-    candles = r.response["candles"]
-    prices = [float(c["mid"]["c"]) for c in candles]
-    df = pd.DataFrame(prices, columns=["close"])
-    return df
-
-def get_signal():
-    df = fetch_candles()
+    # Completed H1 candles from the on-disk buffer, topped up with only the newer ones
+    global candle_cache, bus_reader
+    if MARKET_BUS:
+        if bus_reader is None:
+            bus_reader = BusReader(MARKET_BUS)
+        return bus_reader.frame(CANDLE_CAPACITY)
+    if candle_cache is None:
+        candle_cache = CandleCache(INSTRUMENT, "H1", capacity=CANDLE_CAPACITY, cache_dir=CANDLE_CACHE_DIR)
+    candle_cache.refresh(client, now=datetime.datetime.utcnow())
+    return candle_cache.frame()
+
+def get_signal(df=None):
+    if df is None:
+        df = fetch_candles()
     rsi = RSIIndicator(close=df["close"], window=14).rsi()
     bb = BollingerBands(close=df["close"], window=20, window_dev=2)
     last_rsi = rsi.iloc[-1]
@@ -83,19 +96,14 @@ def run_strategy():
     while True:
         try:
             df = fetch_candles()
-            latest_candle_time = df.index[-1] if hasattr(df.index, "__len__") else None
-            latest_candle_time = df.index[-1].replace(minute=0, second=0, microsecond=0) if hasattr(df.index, "__len__") else None
-
-            # If index not datetime, fallback to UTC now hour:
-            if latest_candle_time is None or not isinstance(latest_candle_time, pd.Timestamp):
-                latest_candle_time = datetime.datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+            latest_candle_time = df.index[-1]
 
             if last_candle_time is None:
                 last_candle_time = latest_candle_time
                 print(f"[{datetime.datetime.utcnow()} UTC] Starting fresh at candle {last_candle_time}")
             elif latest_candle_time > last_candle_time:
                 print(f"[{datetime.datetime.utcnow()} UTC] New candle detected: {latest_candle_time}")
-                signal, price = get_signal()
+                signal, price = get_signal(df)
                 if signal:
                     place_order(signal, price)
                 else:
@@ -111,75 +119,62 @@ def run_strategy():
 
 # --------------- BACKTESTING FUNCTIONS ------------------
 
-def run_backtest(csv_file="EURUSD_1H.csv"):
+def run_backtest(csv_file="EURUSD_1H.csv", tp_pips=TP_PIPS, sl_pips=SL_PIPS, trades_file="backtest_trades.csv"):
     print("Running backtest...")
 
     df = pd.read_csv(csv_file, parse_dates=["time"], index_col="time")
 
-    df["rsi"] = RSIIndicator(close=df["close"], window=14).rsi()
+    close = df["close"].to_numpy()
+    rsi = RSIIndicator(close=df["close"], window=14).rsi().to_numpy()
     bb = BollingerBands(close=df["close"], window=20, window_dev=2)
-    df["bb_low"] = bb.bollinger_lband()
-    df["bb_high"] = bb.bollinger_hband()
+    bb_low = bb.bollinger_lband().to_numpy()
+    bb_high = bb.bollinger_hband().to_numpy()
+    times = df.index
 
-    df["position"] = 0  # 1 = long, -1 = short, 0 = flat
-    df["entry_price"] = 0.0
-    df["exit_price"] = 0.0
-    df["profit"] = 0.0
+    ledger = TradeLedger()
 
     in_position = False
-    position_type = 0
+    position_type = 0  # 1 = long, -1 = short, 0 = flat
     entry_price = 0.0
+    entry_index = 0
 
     for i in range(1, len(df)):
         if not in_position:
-            if df["rsi"].iloc[i] < 30 and df["close"].iloc[i] < df["bb_low"].iloc[i]:
+            if rsi[i] < 30 and close[i] < bb_low[i]:
                 in_position = True
                 position_type = 1
-                entry_price = df["close"].iloc[i]
-                df.at[df.index[i], "position"] = 1
-                df.at[df.index[i], "entry_price"] = entry_price
-            elif df["rsi"].iloc[i] > 70 and df["close"].iloc[i] > df["bb_high"].iloc[i]:
+                entry_price = close[i]
+                entry_index = i
+            elif rsi[i] > 70 and close[i] > bb_high[i]:
                 in_position = True
                 position_type = -1
-                entry_price = df["close"].iloc[i]
-                df.at[df.index[i], "position"] = -1
-                df.at[df.index[i], "entry_price"] = entry_price
+                entry_price = close[i]
+                entry_index = i
         else:
-            current_price = df["close"].iloc[i]
-
-            if position_type == 1:
-                tp_price = entry_price + TP_PIPS
-                sl_price = entry_price - SL_PIPS
-                if current_price >= tp_price:
-                    df.at[df.index[i], "exit_price"] = tp_price
-                    df.at[df.index[i], "profit"] = tp_price - entry_price
-                    in_position = False
-                    position_type = 0
-                elif current_price <= sl_price:
-                    df.at[df.index[i], "exit_price"] = sl_price
-                    df.at[df.index[i], "profit"] = sl_price - entry_price
-                    in_position = False
-                    position_type = 0
-
-            elif position_type == -1:
-                tp_price = entry_price - TP_PIPS
-                sl_price = entry_price + SL_PIPS
-                if current_price <= tp_price:
-                    df.at[df.index[i], "exit_price"] = tp_price
-                    df.at[df.index[i], "profit"] = entry_price - tp_price
-                    in_position = False
-                    position_type = 0
-                elif current_price >= sl_price:
-                    df.at[df.index[i], "exit_price"] = sl_price
-                    df.at[df.index[i], "profit"] = entry_price - sl_price
-                    in_position = False
-                    position_type = 0
-
-    total_profit = df["profit"].sum() * 10000
-    print(f"Total profit over backtest period: {total_profit:.2f} pips")
-
-    df.to_csv("backtest_results.csv")
-    print("Backtest results saved to 'backtest_results.csv'")
+            current_price = close[i]
+            tp_price = entry_price + position_type * tp_pips
+            sl_price = entry_price - position_type * sl_pips
+
+            if position_type * (current_price - tp_price) >= 0:
+                exit_price = tp_price
+            elif position_type * (current_price - sl_price) <= 0:
+                exit_price = sl_price
+            else:
+                continue
+
+            ledger.record(times[entry_index], times[i], entry_index, i, position_type, entry_price, exit_price)
+            in_position = False
+            position_type = 0
+
+    summary = summarize(ledger.trades, len(df))
+    print(f"Total profit over backtest period: {summary['total_pips']:.2f} pips")
+    print_summary(summary)
+
+    if trades_file:
+        ledger.save(trades_file)
+        print(f"Backtest trades saved to '{trades_file}'")
+
+    return ledger, summary
 
 # ------------------- MAIN -------------------
 
@@ -187,4 +182,4 @@ if __name__ == "__main__":
     if RUN_BACKTEST:
         run_backtest()
     else:
-        run_live_strategy()
+        run_strategy()
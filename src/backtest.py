@@ -1,5 +1,6 @@
 from data_fetcher import fetch_data
 from strategy import generate_signal
+from algo2.analytics import exposure, max_drawdown, sharpe_ratio, sortino_ratio
 
 def backtest():
     df = fetch_data()
@@ -16,5 +17,11 @@ def backtest():
     final_return = (1 + df["strategy"]).cumprod().iloc[-1]
     print(f"Backtest return: {final_return:.2f}x")
 
+    strategy_returns = df["strategy"].to_numpy()
+    print(f"Sharpe: {sharpe_ratio(strategy_returns):.2f}")
+    print(f"Sortino: {sortino_ratio(strategy_returns):.2f}")
+    print(f"Max drawdown: {max_drawdown(strategy_returns, compounded=True):.2%}")
+    print(f"Exposure: {exposure(df['position'].to_numpy() != 0, len(df)):.2%}")
+
 if __name__ == "__main__":
     backtest()
@@ -2,9 +2,18 @@ import yfinance as yf
 import pandas as pd
 import ta
 
+from multi_timeframe import add_higher_timeframes
+
 def fetch_data(pair="EURUSD=X", period="30d", interval="1h"):
     df = yf.download(pair, period=period, interval=interval)
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel(1, axis=1)  # (Price, Ticker) header for a single ticker
     df.dropna(inplace=True)
-    df["ema_20"] = ta.trend.ema_indicator(df["Close"], window=20).ema_indicator()
+    df["ema_20"] = ta.trend.ema_indicator(df["Close"], window=20)
     df["rsi_14"] = ta.momentum.RSIIndicator(df["Close"], window=14).rsi()
     return df
+
+def fetch_multi_timeframe_data(pair="EURUSD=X", period="60d", interval="1h", rules=("4h", "1D")):
+    # One download; higher-timeframe indicators are derived from the base bars
+    df = fetch_data(pair=pair, period=period, interval=interval)
+    return add_higher_timeframes(df, base_interval=interval, rules=rules)
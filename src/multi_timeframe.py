@@ -0,0 +1,164 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Higher-timeframe (HTF) bars and indicators derived from one base series.
+# An HTF bar covering [T, T + rule) only becomes visible to base bars that close
+# at or after T + rule, so nothing from an unfinished HTF bar leaks backwards.
+# Indicators follow the ta library definitions used elsewhere in the project:
+# EMA(span, adjust=False), Wilder RSI, Bollinger bands with ddof=0.
+
+
+def resample_bars(df, rule):
+    # Floor-based grouping, so weekend gaps produce no empty HTF bars
+    groups = df.groupby(df.index.floor(rule))
+    bars = pd.DataFrame({
+        "Open": groups["Open"].first(),
+        "High": groups["High"].max(),
+        "Low": groups["Low"].min(),
+        "Close": groups["Close"].last(),
+    })
+    bars["available_at"] = bars.index + pd.Timedelta(rule)
+    return bars
+
+
+def htf_indicators(close, ema_window=20, rsi_window=14, bb_window=20, bb_dev=2):
+    ema = close.ewm(span=ema_window, min_periods=ema_window, adjust=False).mean()
+
+    diff = close.diff()
+    up = diff.where(diff > 0, 0.0).ewm(alpha=1 / rsi_window, min_periods=rsi_window, adjust=False).mean()
+    down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / rsi_window, min_periods=rsi_window, adjust=False).mean()
+    rsi = pd.Series(np.where(down == 0, 100, 100 - 100 / (1 + up / down)), index=close.index).where(down.notna())
+
+    mid = close.rolling(bb_window).mean()
+    std = close.rolling(bb_window).std(ddof=0)
+
+    return pd.DataFrame({
+        "close": close,
+        f"ema_{ema_window}": ema,
+        f"rsi_{rsi_window}": rsi,
+        "bb_low": mid - bb_dev * std,
+        "bb_mid": mid,
+        "bb_high": mid + bb_dev * std,
+    })
+
+
+def add_higher_timeframes(df, base_interval="1h", rules=("4h", "1D"), **indicator_kwargs):
+    # Columns are suffixed with the rule, e.g. ema_20_4h, rsi_14_1D
+    base_close_time = pd.Series(df.index + pd.Timedelta(base_interval), index=df.index, name="base_close_time")
+
+    for rule in rules:
+        bars = resample_bars(df, rule)
+        indicators = htf_indicators(bars["Close"], **indicator_kwargs)
+        indicators["available_at"] = bars["available_at"]
+
+        aligned = pd.merge_asof(
+            base_close_time.to_frame(),
+            indicators.reset_index(drop=True),
+            left_on="base_close_time",
+            right_on="available_at",
+            direction="backward",
+        )
+        for column in indicators.columns.drop("available_at"):
+            df[f"{column}_{rule}"] = aligned[column].to_numpy()
+
+    return df
+
+
+class _EMA:
+    def __init__(self, window):
+        self.alpha = 2 / (window + 1)
+        self.window = window
+        self.count = 0
+        self.value = math.nan
+
+    def update(self, x):
+        self.value = x if self.count == 0 else self.alpha * x + (1 - self.alpha) * self.value
+        self.count += 1
+        return self.value if self.count >= self.window else math.nan
+
+
+class _RSI:
+    def __init__(self, window):
+        self.up = _EMA(window)
+        self.down = _EMA(window)
+        self.up.alpha = self.down.alpha = 1 / window
+        self.previous = None
+
+    def update(self, x):
+        diff = 0.0 if self.previous is None else x - self.previous
+        self.previous = x
+        up = self.up.update(max(diff, 0.0))
+        down = self.down.update(max(-diff, 0.0))
+        if math.isnan(down):
+            return math.nan
+        return 100.0 if down == 0 else 100 - 100 / (1 + up / down)
+
+
+class _Bollinger:
+    def __init__(self, window, dev):
+        self.window = window
+        self.dev = dev
+        self.values = deque(maxlen=window)
+
+    def update(self, x):
+        self.values.append(x)
+        if len(self.values) < self.window:
+            return math.nan, math.nan, math.nan
+        mid = sum(self.values) / self.window
+        std = math.sqrt(sum((v - mid) ** 2 for v in self.values) / self.window)
+        return mid - self.dev * std, mid, mid + self.dev * std
+
+
+class _Timeframe:
+    def __init__(self, rule, ema_window, rsi_window, bb_window, bb_dev):
+        self.rule = rule
+        self.length = pd.Timedelta(rule)
+        self.ema = _EMA(ema_window)
+        self.rsi = _RSI(rsi_window)
+        self.bb = _Bollinger(bb_window, bb_dev)
+        self.names = ["close", f"ema_{ema_window}", f"rsi_{rsi_window}", "bb_low", "bb_mid", "bb_high"]
+
+        self.period = None  # start of the HTF bar being built
+        self.bar = None
+        self.latest = dict.fromkeys(self.names, math.nan)
+
+    def _finalize(self):
+        close = self.bar["Close"]
+        values = [close, self.ema.update(close), self.rsi.update(close), *self.bb.update(close)]
+        self.latest = dict(zip(self.names, values))
+        self.bar = None
+
+    def update(self, time, open_, high, low, close, base_close_time):
+        period = time.floor(self.rule)
+        if self.bar is not None and period != self.period:
+            self._finalize()  # a bar from a later period proves the previous one is done
+
+        if self.bar is None:
+            self.period = period
+            self.bar = {"Open": open_, "High": high, "Low": low, "Close": close}
+        else:
+            self.bar["High"] = max(self.bar["High"], high)
+            self.bar["Low"] = min(self.bar["Low"], low)
+            self.bar["Close"] = close
+
+        if base_close_time >= self.period + self.length:
+            self._finalize()
+
+        return {f"{name}_{self.rule}": value for name, value in self.latest.items()}
+
+
+class MultiTimeframe:
+    # Incremental version of add_higher_timeframes: feed base bars one at a time
+    def __init__(self, base_interval="1h", rules=("4h", "1D"), ema_window=20, rsi_window=14, bb_window=20, bb_dev=2):
+        self.base_length = pd.Timedelta(base_interval)
+        self.timeframes = [_Timeframe(rule, ema_window, rsi_window, bb_window, bb_dev) for rule in rules]
+
+    def update(self, time, open_, high, low, close):
+        time = pd.Timestamp(time)
+        values = {}
+        for timeframe in self.timeframes:
+            values.update(timeframe.update(time, open_, high, low, close, time + self.base_length))
+        return values